@@ -0,0 +1,79 @@
+"""
+post filter indexes
+
+Revision ID: 05bfc510faab
+Revises: c77c0fbaf56b
+Create Date: 2026-10-18 16:02:41.537204
+"""
+from alembic import op
+
+
+revision = "05bfc510faab"
+down_revision = "c77c0fbaf56b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_category_created_at_post_id",
+            "post",
+            ["category", "created_at", "post_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_user_id_created_at_post_id",
+            "post",
+            ["user_id", "created_at", "post_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_created_at_brin",
+            "post",
+            ["created_at"],
+            unique=False,
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+        )
+        # `user_id` is the leading column
+        # of `ix_post_user_id_created_at_post_id`.
+        op.drop_index(
+            "ix_post_user_id",
+            table_name="post",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_user_id",
+            "post",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_post_created_at_brin",
+            table_name="post",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_post_user_id_created_at_post_id",
+            table_name="post",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_post_category_created_at_post_id",
+            table_name="post",
+            postgresql_concurrently=True,
+        )
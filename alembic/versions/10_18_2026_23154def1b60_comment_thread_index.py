@@ -0,0 +1,35 @@
+"""
+comment thread index
+
+Revision ID: 23154def1b60
+Revises: 34549f8c1a71
+Create Date: 2026-10-18 11:12:41.507316
+"""
+from alembic import op
+
+
+revision = "23154def1b60"
+down_revision = "34549f8c1a71"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_index(
+        "ix_comment_post_id_created_at_comment_id",
+        "comment",
+        ["post_id", "created_at", "comment_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index(
+        "ix_comment_post_id_created_at_comment_id", table_name="comment"
+    )
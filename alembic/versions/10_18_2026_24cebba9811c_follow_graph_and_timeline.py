@@ -0,0 +1,105 @@
+"""
+follow graph and timeline
+
+Revision ID: 24cebba9811c
+Revises: cd8e21a39753
+Create Date: 2026-10-18 12:34:18.630142
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "24cebba9811c"
+down_revision = "cd8e21a39753"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "user",
+        sa.Column(
+            "follower_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.create_index(
+        op.f("ix_user_follower_count"),
+        "user",
+        ["follower_count"],
+        unique=False,
+    )
+    op.create_table(
+        "follow",
+        sa.Column("follow_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("follower_id", sa.Integer(), nullable=False),
+        sa.Column("followee_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["followee_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["follower_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("follow_id"),
+        sa.UniqueConstraint(
+            "follower_id", "followee_id", name="uq_follower_followee"
+        ),
+    )
+    op.create_index(
+        op.f("ix_follow_follow_id"), "follow", ["follow_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_follow_followee_id"), "follow", ["followee_id"], unique=False
+    )
+    op.create_table(
+        "timeline",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["post_id"], ["post.post_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "post_id"),
+    )
+    op.create_index(
+        op.f("ix_timeline_post_id"), "timeline", ["post_id"], unique=False
+    )
+    op.create_index(
+        "ix_timeline_user_id_created_at_post_id",
+        "timeline",
+        ["user_id", "created_at", "post_id"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO timeline (user_id, post_id, created_at)
+        SELECT user_id, post_id, created_at FROM post
+        """
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index(
+        "ix_timeline_user_id_created_at_post_id", table_name="timeline"
+    )
+    op.drop_index(op.f("ix_timeline_post_id"), table_name="timeline")
+    op.drop_table("timeline")
+    op.drop_index(op.f("ix_follow_followee_id"), table_name="follow")
+    op.drop_index(op.f("ix_follow_follow_id"), table_name="follow")
+    op.drop_table("follow")
+    op.drop_index(op.f("ix_user_follower_count"), table_name="user")
+    op.drop_column("user", "follower_count")
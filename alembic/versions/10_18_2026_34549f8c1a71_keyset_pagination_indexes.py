@@ -0,0 +1,40 @@
+"""
+keyset pagination indexes
+
+Revision ID: 34549f8c1a71
+Revises: b55c01a6ee17
+Create Date: 2026-10-18 10:03:27.918254
+"""
+from alembic import op
+
+
+revision = "34549f8c1a71"
+down_revision = "b55c01a6ee17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_index(
+        "ix_post_created_at_post_id",
+        "post",
+        ["created_at", "post_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_comment_created_at_comment_id",
+        "comment",
+        ["created_at", "comment_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index("ix_comment_created_at_comment_id", table_name="comment")
+    op.drop_index("ix_post_created_at_post_id", table_name="post")
@@ -0,0 +1,51 @@
+"""
+post trending score
+
+Revision ID: 45f9a5633464
+Revises: 05bfc510faab
+Create Date: 2026-10-18 16:48:12.904371
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "45f9a5633464"
+down_revision = "05bfc510faab"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "post",
+        sa.Column(
+            "trending_score", sa.Float(), server_default="0", nullable=False
+        ),
+    )
+    op.add_column(
+        "post",
+        sa.Column(
+            "trending_decayed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        op.f("ix_post_trending_score"),
+        "post",
+        ["trending_score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index(op.f("ix_post_trending_score"), table_name="post")
+    op.drop_column("post", "trending_decayed_at")
+    op.drop_column("post", "trending_score")
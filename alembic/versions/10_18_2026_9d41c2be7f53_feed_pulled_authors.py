@@ -0,0 +1,78 @@
+"""
+feed pulled authors
+
+Revision ID: 9d41c2be7f53
+Revises: 45f9a5633464
+Create Date: 2026-10-18 20:14:36.218507
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import settings
+
+
+revision = "9d41c2be7f53"
+down_revision = "45f9a5633464"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "post",
+        sa.Column(
+            "fanned_out", sa.Boolean(), server_default="True", nullable=False
+        ),
+    )
+    op.create_table(
+        "pulled_author",
+        sa.Column("follower_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["author_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["follower_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("follower_id", "author_id"),
+    )
+    op.create_index(
+        op.f("ix_pulled_author_author_id"),
+        "pulled_author",
+        ["author_id"],
+        unique=False,
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE post SET fanned_out = false
+            WHERE user_id IN (
+                SELECT user_id FROM "user" WHERE follower_count > :threshold
+            )
+            """
+        ).bindparams(threshold=settings.FEED_FANOUT_MAX_FOLLOWERS)
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO pulled_author (follower_id, author_id)
+            SELECT follow.follower_id, follow.followee_id
+            FROM follow JOIN "user" ON "user".user_id = follow.followee_id
+            WHERE "user".follower_count > :threshold
+            """
+        ).bindparams(threshold=settings.FEED_FANOUT_MAX_FOLLOWERS)
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index(
+        op.f("ix_pulled_author_author_id"), table_name="pulled_author"
+    )
+    op.drop_table("pulled_author")
+    op.drop_column("post", "fanned_out")
@@ -0,0 +1,52 @@
+"""
+post counters
+
+Revision ID: b55c01a6ee17
+Revises: 2860ab17e4f0
+Create Date: 2026-10-18 09:12:41.204377
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b55c01a6ee17"
+down_revision = "2860ab17e4f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "post",
+        sa.Column(
+            "like_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.add_column(
+        "post",
+        sa.Column(
+            "comment_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.execute(
+        """
+        UPDATE post
+        SET like_count = (
+                SELECT count(*) FROM "like" WHERE "like".post_id = post.post_id
+            ),
+            comment_count = (
+                SELECT count(*) FROM comment WHERE comment.post_id = post.post_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_column("post", "comment_count")
+    op.drop_column("post", "like_count")
@@ -0,0 +1,50 @@
+"""
+foreign key indexes
+
+Revision ID: cd8e21a39753
+Revises: 23154def1b60
+Create Date: 2026-10-18 11:47:05.264918
+"""
+from alembic import op
+
+
+revision = "cd8e21a39753"
+down_revision = "23154def1b60"
+branch_labels = None
+depends_on = None
+
+# `comment.post_id` and `like.user_id` are already the leading columns
+# of `ix_comment_post_id_created_at_comment_id` and `uq_user_post`.
+FOREIGN_KEY_INDEXES = (
+    ("ix_post_user_id", "post", "user_id"),
+    ("ix_comment_user_id", "comment", "user_id"),
+    ("ix_like_post_id", "like", "post_id"),
+)
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in FOREIGN_KEY_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                [column_name],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(FOREIGN_KEY_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+            )
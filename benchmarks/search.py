@@ -0,0 +1,196 @@
+"""
+The benchmark seeds a scratch database with posts and measures
+the latency of the full-text search query behind `GET /posts/search`
+for rare, common and combined search terms.
+
+Usage: python -m benchmarks.search [--posts 2000000] [--runs 200]
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database import SQLALCHEMY_DATABASE_URL
+from src.models import Base, Category, SEARCH_CONFIG
+from src.search import build_search_query
+
+
+DATABASE_NAME_SUFFIX = "_benchmark"
+PAGE_SIZE = 10
+
+# The words are picked with a skewed distribution,
+# so the first ones are common and the last ones are uncommon.
+# Every post also gets one of `TAGS` rare `tag<number>` words.
+WORDS = (
+    "life work people time world year food travel music health "
+    "money family city game team market school nature water energy "
+    "science history design garden coffee summer winter river mountain "
+    "ocean forest planet climate economy election football marathon "
+    "recipe burger vegan startup robot galaxy telescope volcano glacier "
+    "saxophone origami pottery calligraphy hieroglyph zeppelin"
+).split()
+TAGS = 5000
+
+QUERIES = {
+    "common word": ("life", None),
+    "uncommon": ("zeppelin", None),
+    "rare word": ("tag1234", None),
+    "two words": ("climate economy", None),
+    "phrase": ('"summer river"', None),
+    "or": ("telescope or volcano", None),
+    "category": ("travel", Category.FOOD),
+}
+
+
+def create_database(url: str) -> Engine:
+    """
+    The function creates the scratch database if it does not exist
+    and returns an engine connected to it.
+    """
+    server_engine = create_engine(
+        url.rsplit("/", 1)[0] + "/postgres", isolation_level="AUTOCOMMIT"
+    )
+    name = url.rsplit("/", 1)[1]
+
+    with server_engine.connect() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": name},
+        ).scalar()
+
+        if not exists:
+            connection.exec_driver_sql(f'CREATE DATABASE "{name}"')
+
+    server_engine.dispose()
+
+    return create_engine(url)
+
+
+def seed(engine: Engine, posts: int) -> None:
+    """
+    The function recreates the tables and inserts `posts` rows
+    with titles and content built from `WORDS`.
+    """
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    word = (
+        "(:words)[1 + floor(:count * power("
+        "(hashtext(n::text || '-' || i::text) & 2147483647)"
+        " / 2147483648.0, 3))::int]"
+    )
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                INSERT INTO "user" (username, email, password)
+                SELECT 'bench' || n, 'bench' || n || '@example.com', 'x'
+                FROM generate_series(1, 1000) AS n
+                """
+            )
+        )
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO post (title, content, category, user_id)
+                SELECT
+                    (SELECT string_agg({word}, ' ')
+                     FROM generate_series(1, 4) AS i),
+                    (SELECT string_agg({word}, ' ')
+                     FROM generate_series(5, 34) AS i)
+                    || ' tag' || n % :tags,
+                    (enum_range(NULL::category))[1 + n % 10],
+                    1 + n % 1000
+                FROM generate_series(1, :posts) AS n
+                """
+            ),
+            {
+                "words": WORDS,
+                "count": len(WORDS),
+                "tags": TAGS,
+                "posts": posts,
+            },
+        )
+
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        connection.exec_driver_sql("VACUUM ANALYZE")
+
+
+def measure(
+    engine: Engine, q: str, category: Category | None, runs: int
+) -> list[float]:
+    """
+    The function returns the latencies of the first page
+    of a search in milliseconds.
+    """
+    latencies = []
+
+    with Session(engine) as session:
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            session.execute(
+                build_search_query(q, category, after=None, limit=PAGE_SIZE)
+            ).all()
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    return latencies
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    return statistics.quantiles(latencies, n=100)[percent - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_database(SQLALCHEMY_DATABASE_URL + DATABASE_NAME_SUFFIX)
+
+    if not args.skip_seed:
+        started_at = time.perf_counter()
+        seed(engine, args.posts)
+        print(
+            f"seeded {args.posts} posts "
+            f"in {time.perf_counter() - started_at:.1f} s"
+        )
+
+    print(f"{'query':<12} {'matches':>9} {'p50':>9} {'p99':>9}")
+
+    for name, (q, category) in QUERIES.items():
+        with engine.connect() as connection:
+            matches = connection.execute(
+                text(
+                    """
+                    SELECT count(*) FROM post
+                    WHERE search_vector @@ websearch_to_tsquery(:config, :q)
+                    AND (
+                        CAST(:category AS category) IS NULL
+                        OR category = :category
+                    )
+                    """
+                ),
+                {
+                    "config": SEARCH_CONFIG,
+                    "q": q,
+                    "category": category and category.value,
+                },
+            ).scalar()
+
+        latencies = measure(engine, q, category, args.runs)
+        print(
+            f"{name:<12} {matches:>9} "
+            f"{percentile(latencies, 50):>7.1f}ms "
+            f"{percentile(latencies, 99):>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+The benchmark compares the time needed to serialize a page of 100 posts
+through the response model validation and the default JSON response
+with the direct serialization through `orjson`.
+
+Usage: python -m benchmarks.serialization
+"""
+import json
+import timeit
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from src.models import Category, Post, User
+from src.schemas import PostLikeCommentResponse
+from src.serializers import serialize_post_row
+
+
+PAGE_SIZE = 100
+NUMBER = 200
+
+PostRow = namedtuple("PostRow", ["Post", "likes", "comments"])
+
+
+def build_page() -> list[PostRow]:
+    """
+    The function builds a page of `(Post, likes, comments)` rows
+    without touching the database.
+    """
+    now = datetime.now(timezone.utc)
+    author = User(user_id=1, username="jessica", email="jessica@gmail.com")
+
+    return [
+        PostRow(
+            Post(
+                post_id=post_id,
+                title=f"Post number {post_id}",
+                content="Public speaking is an essential skill. " * 5,
+                category=Category.EDUCATION,
+                created_at=now,
+                updated_at=now,
+                author=author,
+            ),
+            10,
+            3,
+        )
+        for post_id in range(PAGE_SIZE)
+    ]
+
+
+def serialize_with_response_model(page: list[PostRow]) -> bytes:
+    """
+    The function mimics FastAPI: validate against the `response_model`,
+    convert to JSON-compatible data and encode with the standard library.
+    """
+    validated = parse_obj_as(list[PostLikeCommentResponse], page)
+
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def serialize_directly(page: list[PostRow]) -> bytes:
+    """
+    The function builds the response dicts from the rows
+    and encodes them with `orjson`.
+    """
+    return orjson.dumps([serialize_post_row(row) for row in page])
+
+
+def main() -> None:
+    page = build_page()
+
+    assert orjson.loads(serialize_with_response_model(page)) == orjson.loads(
+        serialize_directly(page)
+    )
+
+    for name, serialize in (
+        ("response model + json", serialize_with_response_model),
+        ("direct dicts + orjson", serialize_directly),
+    ):
+        seconds = min(
+            timeit.repeat(lambda: serialize(page), number=NUMBER, repeat=5)
+        )
+        print(f"{name}: {seconds / NUMBER * 1000:.3f} ms per page")
+
+
+if __name__ == "__main__":
+    main()
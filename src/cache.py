@@ -0,0 +1,306 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+from urllib.parse import urlsplit
+
+from src.config import settings
+
+
+class TTLCache:
+    """
+    A bounded in-process cache that evicts the least recently used entry
+    when it is full and treats entries older than `ttl` seconds as missing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_ttl: float | None = None
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        The method returns a cached value or `None`
+        if the `key` is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        The method stores a `value` under the `key`
+        for `ttl` seconds, or the default `ttl` of the cache,
+        but never longer than `max_ttl` seconds if it is set.
+        """
+        ttl = ttl or self.ttl
+
+        if self.max_ttl is not None:
+            ttl = min(ttl, self.max_ttl)
+
+        with self._lock:
+            self._entries[key] = (self.timer() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        The method removes the `key` from the cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        The method removes all entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CacheBackend(ABC):
+    """
+    The interface of a storage that keeps serialized responses.
+    A shared implementation (e.g. Redis) lets several workers
+    use a common cache.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        The method returns the value under the `key`
+        or `None` if it is missing or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        The method stores the `value` under the `key` for `ttl` seconds.
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        The method removes the `keys`.
+        """
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    A cache storage kept in the memory of a single worker.
+    The least recently used entries are dropped when it is full.
+    """
+
+    def __init__(
+        self, maxsize: int, timer: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.entries = TTLCache(maxsize=maxsize, ttl=0, timer=timer)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.entries.delete(key)
+
+    def clear(self) -> None:
+        """
+        The method removes all entries and resets the counters.
+        """
+        self.entries.clear()
+
+
+class RedisReplyError(Exception):
+    """
+    A custom exception is raised when the Redis server replies with an error.
+    """
+
+
+# `asyncio.TimeoutError` is an alias of `TimeoutError` only since Python 3.11.
+CONNECTION_ERRORS = (
+    OSError,
+    EOFError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    RedisReplyError,
+)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    A cache storage on a server that speaks the Redis protocol,
+    shared by all workers. The commands are sent over one connection
+    per event loop, and an unavailable server behaves as an empty cache.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        parsed_url = urlsplit(url)
+        self.host = parsed_url.hostname or "localhost"
+        self.port = parsed_url.port or 6379
+        self.password = parsed_url.password
+        self.database = int(parsed_url.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.errors = 0
+        self._connection: tuple[Any, ...] | None = None
+
+    @staticmethod
+    def _encode(*args: str | bytes) -> bytes:
+        """
+        The method encodes a command as an array of bulk strings.
+        """
+        command = [b"*%d\r\n" % len(args)]
+
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+
+        return b"".join(command)
+
+    @classmethod
+    async def _read_reply(cls, reader: asyncio.StreamReader) -> Any:
+        """
+        The method reads a single reply of the server.
+        """
+        line = await reader.readuntil(b"\r\n")
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RedisReplyError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            if payload == b"-1":
+                return None
+            return (await reader.readexactly(int(payload) + 2))[:-2]
+        if kind == b"*":
+            return [await cls._read_reply(reader) for _ in range(int(payload))]
+
+        raise RedisReplyError(f"Unexpected reply: {line!r}")
+
+    async def _connect(self) -> tuple[Any, ...]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (
+            asyncio.get_running_loop(),
+            reader,
+            writer,
+            asyncio.Lock(),
+        )
+
+        if self.password:
+            await self._send(connection, "AUTH", self.password)
+        if self.database:
+            await self._send(connection, "SELECT", str(self.database))
+
+        return connection
+
+    async def _send(
+        self, connection: tuple[Any, ...], *args: str | bytes
+    ) -> Any:
+        _, reader, writer, lock = connection
+
+        async with lock:
+            writer.write(self._encode(*args))
+            await writer.drain()
+
+            return await self._read_reply(reader)
+
+    async def _execute(self, *args: str | bytes) -> Any:
+        if (
+            self._connection is None
+            or self._connection[0] is not asyncio.get_running_loop()
+        ):
+            self._connection = await self._connect()
+
+        return await self._send(self._connection, *args)
+
+    async def execute(self, *args: str | bytes) -> Any:
+        """
+        The method sends a command and returns the reply of the server.
+        A broken connection is dropped and opened again by the next command.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._execute(*args), timeout=self.timeout
+            )
+        except BaseException:
+            # A command interrupted halfway leaves its reply in the stream.
+            self.close()
+
+            raise
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.execute("GET", key)
+        except CONNECTION_ERRORS:
+            self.errors += 1
+
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self.execute("SET", key, value, "PX", str(int(ttl * 1000)))
+        except CONNECTION_ERRORS:
+            self.errors += 1
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self.execute("DEL", *keys)
+        except CONNECTION_ERRORS:
+            self.errors += 1
+
+    def close(self) -> None:
+        """
+        The method closes the connection to the server.
+        """
+        if self._connection is not None:
+            loop, _, writer, _ = self._connection
+            self._connection = None
+
+            if not loop.is_closed():
+                writer.close()
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    The function returns the cache storage selected by `CACHE_BACKEND`.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+
+    return InMemoryCacheBackend(maxsize=settings.CACHE_MAXSIZE)
@@ -7,10 +7,65 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_DB: str
+    DATABASE_ASYNC: bool = False
+    POSTGRES_REPLICA_HOST: str = ""
+    POSTGRES_REPLICA_PORT: str = ""
+    POSTGRES_REPLICA_DB: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_POOL_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30
+    DATABASE_POOL_RECYCLE_SECONDS: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_POOL_PREWARM: bool = True
+    INTERNAL_ENDPOINTS: bool = False
+    MAX_PAGE_SIZE: int = 100
 
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    AUTH_STATELESS: bool = False
+    STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES: int = 5
+
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_MAX_QUEUE: int = 64
+
+    PASSWORD_RATE_LIMIT_IP_BURST: int = 20
+    PASSWORD_RATE_LIMIT_IP_PER_MINUTE: float = 30
+    PASSWORD_RATE_LIMIT_ACCOUNT_BURST: int = 5
+    PASSWORD_RATE_LIMIT_ACCOUNT_PER_MINUTE: float = 5
+    RATE_LIMIT_MAX_BUCKETS: int = 100_000
+
+    USER_CACHE_MAXSIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10_000
+    FEED_BACKFILL_POSTS: int = 20
+
+    TRENDING_SIZE: int = 100
+    TRENDING_REFRESH_SECONDS: float = 10
+    TRENDING_DECAY_SECONDS: float = 300
+    TRENDING_HALF_LIFE_HOURS: float = 24
+    TRENDING_LIKE_WEIGHT: float = 1
+    TRENDING_COMMENT_WEIGHT: float = 2
+    TRENDING_MIN_SCORE: float = 0.01
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAXSIZE: int = 10_000
+    POST_CACHE_TTL_SECONDS: float = 60
+    POST_PAGE_CACHE_TTL_SECONDS: float = 5
+    POST_PAGE_CACHE_SIZE: int = 50
+    CACHE_INVALIDATION_NOTIFY: bool = False
+    CACHE_INVALIDATION_BATCH_SECONDS: float = 0.05
+    CACHE_INVALIDATION_FALLBACK_TTL_SECONDS: float = 5
+    CACHE_INVALIDATION_HEARTBEAT_SECONDS: float = 10
+    LIKE_WRITE_BEHIND: bool = False
+    LIKE_FLUSH_SECONDS: float = 1
+    LIKE_BUFFER_MAX_SIZE: int = 10_000
+    LIVE_QUEUE_SIZE: int = 100
+    LIVE_LIKE_INTERVAL_SECONDS: float = 1
+    LIVE_HEARTBEAT_SECONDS: float = 15
 
     class Config:
         env_file = ".env"
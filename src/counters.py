@@ -0,0 +1,53 @@
+from typing import Mapping
+
+from sqlalchemy import case, Column, update
+from sqlalchemy.sql import Update
+
+from src.models import Post, User
+from src.trending import bump_trending_score
+
+
+def update_post_counters() -> Update:
+    """
+    The function starts an `UPDATE` of the counters of the `posts`
+    that keeps their `updated_at`, since a new like or comment
+    is not an edit of the `post`.
+    """
+    return (
+        update(Post)
+        .values({Post.updated_at: Post.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_user_counters() -> Update:
+    """
+    The function starts an `UPDATE` of the counters of the `users`
+    that keeps their `updated_at`, which is part of the `ETag`
+    of their `posts`, since a new follower is not an edit of the `user`.
+    """
+    return (
+        update(User)
+        .values({User.updated_at: User.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_post_counter(
+    column: Column, deltas: Mapping[int, int], trending_weight: float = 0
+) -> Update:
+    """
+    The function builds a single `UPDATE` statement that adds
+    the per-post `deltas` (`post_id` -> delta) to the counter `column`
+    and, with a `trending_weight`, the weighted deltas
+    to the `trending_score`.
+    """
+    delta = case(dict(deltas), value=Post.post_id, else_=0)
+    values = {column: column + delta}
+
+    if trending_weight:
+        values.update(bump_trending_score(delta * trending_weight))
+
+    return (
+        update_post_counters().filter(Post.post_id.in_(deltas)).values(values)
+    )
@@ -1,9 +1,19 @@
-from typing import Generator
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Generator
 
+from fastapi import Depends
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 
 from src.config import settings
+from src.pool import MeasuredAsyncAdaptedQueuePool, MeasuredQueuePool
 
 
 SQLALCHEMY_DATABASE_URL = (
@@ -14,10 +24,137 @@ SQLALCHEMY_DATABASE_URL = (
     f"{settings.POSTGRES_PORT}/"
     f"{settings.POSTGRES_DB}"
 )
+ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+REPLICA_DATABASE_URL = (
+    f"postgresql://"
+    f"{settings.POSTGRES_USER}:"
+    f"{settings.POSTGRES_PASSWORD}@"
+    f"{settings.POSTGRES_REPLICA_HOST or settings.POSTGRES_HOST}:"
+    f"{settings.POSTGRES_REPLICA_PORT or settings.POSTGRES_PORT}/"
+    f"{settings.POSTGRES_REPLICA_DB or settings.POSTGRES_DB}"
+)
+ASYNC_REPLICA_DATABASE_URL = REPLICA_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+POOL_OPTIONS = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_POOL_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+}
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=MeasuredQueuePool, **POOL_OPTIONS
+)
+
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=MeasuredAsyncAdaptedQueuePool,
+    **POOL_OPTIONS,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=async_engine
+)
+
+# Without a configured replica the reads use the primary engines.
+if settings.POSTGRES_REPLICA_HOST:
+    replica_engine = create_engine(
+        REPLICA_DATABASE_URL, poolclass=MeasuredQueuePool, **POOL_OPTIONS
+    ).execution_options(postgresql_readonly=True)
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL,
+        poolclass=MeasuredAsyncAdaptedQueuePool,
+        **POOL_OPTIONS,
+    ).execution_options(postgresql_readonly=True)
+else:
+    replica_engine = engine
+    async_replica_engine = async_engine
+
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=replica_engine,
+)
+
+AsyncReplicaSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=async_replica_engine
+)
+
+
+class ThreadedSession:
+    """
+    The class exposes the `AsyncSession` interface over a synchronous
+    `Session` by running every database call in the threadpool.
+    The calls run one at a time, so a call cancelled while it still runs
+    in its thread finishes before the next one, e.g. `close()`, starts.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+        self._lock = Lock()
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: list[Any]) -> None:
+        self.sync_session.add_all(instances)
+
+    async def _run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        def locked() -> Any:
+            with self._lock:
+                return fn(*args, **kwargs)
+
+        return await run_in_threadpool(locked)
+
+    async def run_sync(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(
+            self.sync_session.execute, statement, *args, **kwargs
+        )
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(
+            self.sync_session.scalar, statement, *args, **kwargs
+        )
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(
+            self.sync_session.scalars, statement, *args, **kwargs
+        )
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance: Any, *args: Any, **kwargs: Any) -> None:
+        await self._run(self.sync_session.refresh, instance, *args, **kwargs)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    async def delete(self, instance: Any) -> None:
+        await self._run(self.sync_session.delete, instance)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async def flush(self) -> None:
+        await self._run(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await self._run(self.sync_session.close)
 
 
 def get_db() -> Generator:
@@ -29,3 +166,81 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    The function of creating and closing the async session database.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_threaded_db(
+    db: Session = Depends(get_db),
+) -> AsyncGenerator:
+    """
+    The function wraps the synchronous session database
+    into the `AsyncSession` interface.
+    """
+    yield ThreadedSession(db)
+
+
+def get_replica_db() -> Generator:
+    """
+    The function of creating and closing the session database
+    of the read replica.
+    """
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_replica_db() -> AsyncGenerator:
+    """
+    The function of creating and closing the async session database
+    of the read replica.
+    """
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
+
+
+async def get_threaded_replica_db(
+    db: Session = Depends(get_replica_db),
+) -> AsyncGenerator:
+    """
+    The function wraps the synchronous session database
+    of the read replica into the `AsyncSession` interface.
+    """
+    yield ThreadedSession(db)
+
+
+get_session = get_async_db if settings.DATABASE_ASYNC else get_threaded_db
+get_replica_session = (
+    get_async_replica_db
+    if settings.DATABASE_ASYNC
+    else get_threaded_replica_db
+)
+session_engine = async_engine if settings.DATABASE_ASYNC else engine
+replica_session_engine = (
+    async_replica_engine if settings.DATABASE_ASYNC else replica_engine
+)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession | ThreadedSession]:
+    """
+    The function opens the session database for the work
+    that runs outside of a request, e.g. in a background task.
+    """
+    if settings.DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = ThreadedSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
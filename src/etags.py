@@ -0,0 +1,86 @@
+import hashlib
+from typing import Any
+
+from fastapi import Response, status
+from sqlalchemy import Row
+
+from src.models import Comment, Post, User
+
+
+ETAG_HEADER = "ETag"
+
+# The columns a version lookup selects, in the order of `post_version`
+# and `comment_version`, with the author joined on `User`.
+POST_VERSION_COLUMNS = (
+    Post.post_id,
+    Post.updated_at,
+    Post.like_count,
+    Post.comment_count,
+    User.updated_at,
+)
+COMMENT_VERSION_COLUMNS = (
+    Comment.comment_id,
+    Comment.updated_at,
+    User.updated_at,
+)
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """
+    The function returns an entity tag that changes
+    whenever any of the `parts` changes.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def post_version(row: Row) -> tuple[Any, ...]:
+    """
+    The function returns the values of a `(Post, likes, comments)` row
+    that its entity tag is derived from.
+    """
+    return (
+        row.Post.post_id,
+        row.Post.updated_at,
+        row.likes,
+        row.comments,
+        row.Post.author.updated_at,
+    )
+
+
+def comment_version(comment: Comment) -> tuple[Any, ...]:
+    """
+    The function returns the values of a `comment`
+    that its entity tag is derived from.
+    """
+    return (comment.comment_id, comment.updated_at, comment.author.updated_at)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    The function checks whether the `If-None-Match` header
+    lists the `etag`, ignoring the weak prefix of both tags.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag
+        for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    """
+    The function returns an empty `304 Not Modified` response.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={**(headers or {}), ETAG_HEADER: etag},
+    )
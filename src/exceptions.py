@@ -108,3 +108,44 @@ class ContentFormatException(HTTPException):
         super().__init__(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
         )
+
+
+class CursorFormatException(HTTPException):
+    """
+    A custom exception is raised when the pagination `cursor` has an incorrect format.
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=detail
+        )
+
+
+class PasswordHashingOverloadException(HTTPException):
+    """
+    A custom exception is raised when the password hashing queue is full
+    or its worker processes are restarting.
+    """
+
+    def __init__(self, detail: str, retry_after: int) -> None:
+        self.detail = detail
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class TooManyRequestsException(HTTPException):
+    """
+    A custom exception is raised when the client exceeds the rate limit.
+    """
+
+    def __init__(self, detail: str, retry_after: int) -> None:
+        self.detail = detail
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,186 @@
+from typing import Iterable
+
+from sqlalchemy import (
+    Delete,
+    delete,
+    Insert,
+    or_,
+    select,
+    Select,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
+
+from src.config import settings
+from src.models import Follow, Post, PulledAuthor, Timeline, User
+from src.pagination import paginate
+
+
+TIMELINE_COLUMNS = ["user_id", "post_id", "created_at"]
+
+
+def fan_out_posts(post_ids: Iterable[int]) -> Insert:
+    """
+    The function builds a single `INSERT` statement that copies new `posts`
+    to the timeline of their author and of every follower.
+    The `posts` of authors with more than `FEED_FANOUT_MAX_FOLLOWERS`
+    followers are marked as not fanned out instead,
+    they are pulled when the feed is read.
+    """
+    post_ids = list(post_ids)
+    pulled_posts = (
+        update(Post.__table__)
+        .filter(
+            Post.post_id.in_(post_ids),
+            Post.user_id.in_(
+                select(User.user_id).filter(
+                    User.follower_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+                )
+            ),
+        )
+        .values(fanned_out=False, updated_at=Post.updated_at)
+        .returning(Post.post_id)
+        .cte("pulled_posts")
+    )
+    authors = select(Post.user_id, Post.post_id, Post.created_at).filter(
+        Post.post_id.in_(post_ids)
+    )
+    followers = (
+        select(Follow.follower_id, Post.post_id, Post.created_at)
+        .join(Post, Post.user_id == Follow.followee_id)
+        .filter(
+            Post.post_id.in_(post_ids),
+            Post.post_id.not_in(select(pulled_posts.c.post_id)),
+        )
+    )
+
+    return (
+        insert(Timeline)
+        .from_select(TIMELINE_COLUMNS, union_all(authors, followers))
+        .on_conflict_do_nothing()
+    )
+
+
+def backfill_timeline(follower_id: int, followee_id: int) -> Insert:
+    """
+    The function builds a single `INSERT` statement that copies
+    the latest `posts` of a newly followed user to the follower's timeline.
+    """
+    return (
+        insert(Timeline)
+        .from_select(
+            TIMELINE_COLUMNS,
+            select(Follow.follower_id, Post.post_id, Post.created_at)
+            .join(Post, Post.user_id == Follow.followee_id)
+            .filter(
+                Follow.follower_id == follower_id,
+                Follow.followee_id == followee_id,
+            )
+            .order_by(Post.created_at.desc(), Post.post_id.desc())
+            .limit(settings.FEED_BACKFILL_POSTS),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def add_pulled_authors(follower_id: int, followee_id: int) -> Insert:
+    """
+    The function builds a single `INSERT` statement that adds
+    a followed user with more than `FEED_FANOUT_MAX_FOLLOWERS` followers
+    to the authors pulled into the follower's feed. The follow
+    that crosses the limit adds the user to the pulled authors
+    of all their followers, since their next `posts` are not fanned out.
+    """
+    return (
+        insert(PulledAuthor)
+        .from_select(
+            ["follower_id", "author_id"],
+            select(Follow.follower_id, Follow.followee_id)
+            .join(User, User.user_id == Follow.followee_id)
+            .filter(
+                Follow.followee_id == followee_id,
+                User.follower_count > settings.FEED_FANOUT_MAX_FOLLOWERS,
+                or_(
+                    Follow.follower_id == follower_id,
+                    User.follower_count
+                    == settings.FEED_FANOUT_MAX_FOLLOWERS + 1,
+                ),
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def prune_timeline(follower_id: int, followee_id: int) -> Delete:
+    """
+    The function builds a single `DELETE` statement that removes
+    the `posts` of an unfollowed user from the follower's timeline.
+    """
+    return (
+        delete(Timeline)
+        .filter(
+            Timeline.user_id == follower_id,
+            Timeline.post_id.in_(
+                select(Post.post_id).filter(Post.user_id == followee_id)
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def remove_pulled_author(follower_id: int, followee_id: int) -> Delete:
+    """
+    The function builds a single `DELETE` statement that removes
+    an unfollowed user from the authors pulled into the follower's feed.
+    """
+    return delete(PulledAuthor).filter(
+        PulledAuthor.follower_id == follower_id,
+        PulledAuthor.author_id == followee_id,
+    )
+
+
+def build_feed_query(user_id: int, after: str | None, limit: int) -> Select:
+    """
+    The function builds the query of a single feed page: a range read
+    of the user's timeline merged with the latest `posts`
+    of the pulled authors that were not fanned out.
+    """
+    fanned_out = paginate(
+        query=select(Timeline.post_id).filter(Timeline.user_id == user_id),
+        position=Timeline.created_at,
+        key=Timeline.post_id,
+        after=after,
+        offset=0,
+        limit=limit,
+    )
+    pulled = paginate(
+        query=select(Post.post_id)
+        .join(PulledAuthor, PulledAuthor.author_id == Post.user_id)
+        .filter(
+            PulledAuthor.follower_id == user_id, Post.fanned_out.is_(False)
+        ),
+        position=Post.created_at,
+        key=Post.post_id,
+        after=after,
+        offset=0,
+        limit=limit,
+    )
+    entries = union(fanned_out, pulled).subquery()
+
+    return paginate(
+        query=select(
+            Post,
+            Post.like_count.label("likes"),
+            Post.comment_count.label("comments"),
+        )
+        .join(entries, entries.c.post_id == Post.post_id)
+        .options(joinedload(Post.author)),
+        position=Post.created_at,
+        key=Post.post_id,
+        after=after,
+        offset=0,
+        limit=limit,
+    )
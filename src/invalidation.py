@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import InMemoryCacheBackend, TTLCache
+from src.config import settings
+from src.database import SQLALCHEMY_DATABASE_URL
+from src.models import User
+from src.oauth2 import user_cache
+from src.post_cache import post_cache, post_cache_generation
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+# Postgres rejects notification payloads of 8000 bytes or more.
+MAX_PAYLOAD_SIZE = 7900
+
+
+def user_key(user_id: int) -> str:
+    """
+    The function returns the invalidation key of a cached `user`.
+    """
+    return f"user:{user_id}"
+
+
+def split_payloads(keys: Iterable[str]) -> list[str]:
+    """
+    The function joins the `keys` into as few notification payloads
+    as the payload size limit allows.
+    """
+    payloads = []
+    payload = ""
+
+    for key in dict.fromkeys(keys):
+        if payload and len(payload) + len(key) + 1 > MAX_PAYLOAD_SIZE:
+            payloads.append(payload)
+            payload = ""
+        payload = f"{payload},{key}" if payload else key
+
+    if payload:
+        payloads.append(payload)
+
+    return payloads
+
+
+async def publish_invalidation(db: AsyncSession, keys: list[str]) -> None:
+    """
+    The function notifies the other workers about the changed `keys`.
+    Postgres delivers the notifications only when the transaction
+    commits, so the function must be called before the commit.
+    """
+    if not settings.CACHE_INVALIDATION_NOTIFY:
+        return
+
+    for payload in split_payloads(keys):
+        await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def evict(keys: Iterable[str], shared: bool = True) -> list[str]:
+    """
+    The function removes the `keys` from the caches of this worker
+    and returns the keys left for the shared `post_cache`,
+    which only need to be deleted there if `shared` is set.
+    Every evicted `post` key bumps the `post_cache_generation`.
+    """
+    post_keys = []
+
+    for key in keys:
+        kind, _, identifier = key.partition(":")
+
+        if kind == "user":
+            user_cache.delete(int(identifier))
+            continue
+
+        post_cache_generation.bump()
+
+        if isinstance(post_cache, InMemoryCacheBackend):
+            post_cache.entries.delete(key)
+        elif shared:
+            post_keys.append(key)
+
+    return post_keys
+
+
+async def commit_and_invalidate(db: AsyncSession, keys: list[str]) -> None:
+    """
+    The function commits the session database, notifies the other
+    workers about the changed `keys` and evicts them from the caches.
+    """
+    await publish_invalidation(db, keys)
+    await db.commit()
+
+    post_keys = evict(keys)
+
+    if post_keys:
+        await post_cache.delete(*post_keys)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def publish_user_invalidation(mapper, connection, target: User) -> None:
+    """
+    The function notifies the other workers about a `user`
+    updated or deleted through the ORM, in the same transaction.
+    """
+    if settings.CACHE_INVALIDATION_NOTIFY:
+        connection.execute(
+            select(func.pg_notify(CHANNEL, user_key(target.user_id)))
+        )
+
+
+def local_caches() -> list[TTLCache]:
+    """
+    The function returns the caches kept in the memory of this worker.
+    """
+    caches = [user_cache]
+
+    if isinstance(post_cache, InMemoryCacheBackend):
+        caches.append(post_cache.entries)
+
+    return caches
+
+
+class InvalidationListener:
+    """
+    The class listens to the invalidation notifications of all workers
+    and evicts the keys from the caches of this worker. The keys received
+    during `batch_interval` seconds are evicted together, once each.
+    While the listener is disconnected, notifications may be missed,
+    so the local caches keep entries for at most `fallback_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_interval: float,
+        fallback_ttl: float,
+        heartbeat_interval: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.url = url
+        self.batch_interval = batch_interval
+        self.fallback_ttl = fallback_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.timer = timer
+        self.connected = False
+        self.received = 0
+        self.evicted = 0
+        self._pending: set[str] = set()
+
+    def receive(
+        self, connection, pid: int, channel: str, payload: str
+    ) -> None:
+        """
+        The method collects the keys of a notification.
+        """
+        self.received += 1
+        self._pending.update(payload.split(","))
+
+    def flush(self) -> None:
+        """
+        The method evicts the collected keys.
+        """
+        keys, self._pending = self._pending, set()
+        evict(keys, shared=False)
+        self.evicted += len(keys)
+
+    def set_connected(self, connected: bool) -> None:
+        """
+        The method switches the local caches between the normal TTLs
+        and the `fallback_ttl` and drops their entries,
+        which could have missed notifications.
+        """
+        self.connected = connected
+        self._pending.clear()
+
+        for cache in local_caches():
+            cache.max_ttl = None if connected else self.fallback_ttl
+            cache.clear()
+
+    async def run(self) -> None:
+        """
+        The method listens to the notifications and reconnects
+        after a failure until it is cancelled.
+        """
+        self.set_connected(False)
+
+        while True:
+            try:
+                connection = await asyncpg.connect(self.url)
+                try:
+                    await connection.add_listener(CHANNEL, self.receive)
+                    self.set_connected(True)
+                    checked_at = self.timer()
+
+                    while True:
+                        await asyncio.sleep(self.batch_interval)
+                        self.flush()
+
+                        if (
+                            self.timer() - checked_at
+                            >= self.heartbeat_interval
+                        ):
+                            await connection.fetchval(
+                                "SELECT 1", timeout=self.heartbeat_interval
+                            )
+                            checked_at = self.timer()
+                finally:
+                    self.set_connected(False)
+                    connection.terminate()
+            except Exception:
+                logger.exception("The cache invalidation listener failed.")
+
+            await asyncio.sleep(self.heartbeat_interval)
+
+
+invalidation_listener = InvalidationListener(
+    url=SQLALCHEMY_DATABASE_URL,
+    batch_interval=settings.CACHE_INVALIDATION_BATCH_SECONDS,
+    fallback_ttl=settings.CACHE_INVALIDATION_FALLBACK_TTL_SECONDS,
+    heartbeat_interval=settings.CACHE_INVALIDATION_HEARTBEAT_SECONDS,
+)
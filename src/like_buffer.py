@@ -0,0 +1,195 @@
+import asyncio
+import logging
+from collections import Counter
+
+from sqlalchemy import column, delete, Integer, select, tuple_, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.counters import bump_post_counter
+from src.database import session_scope
+from src.invalidation import commit_and_invalidate
+from src.live import live_hub
+from src.models import Like, Post
+from src.post_cache import post_cache_keys
+
+
+logger = logging.getLogger(__name__)
+
+
+async def write_like_intents(
+    db: AsyncSession, intents: dict[tuple[int, int], bool]
+) -> None:
+    """
+    The function writes the like intents (`(user_id, post_id)` -> liked)
+    with one `INSERT` and one `DELETE`, moves the counters and the trending
+    scores of the changed `posts` with one `UPDATE` and commits.
+    Intents for missing or own `posts` and the ones already
+    in the database are skipped.
+    """
+    to_like = [key for key, liked in intents.items() if liked]
+    to_unlike = [key for key, liked in intents.items() if not liked]
+    deltas = Counter()
+
+    if to_like:
+        intent = values(
+            column("user_id", Integer),
+            column("post_id", Integer),
+            name="intent",
+        ).data(to_like)
+        deltas.update(
+            await db.scalars(
+                insert(Like.__table__)
+                .from_select(
+                    ["user_id", "post_id"],
+                    select(intent.c.user_id, intent.c.post_id)
+                    .join(Post, Post.post_id == intent.c.post_id)
+                    .filter(Post.user_id != intent.c.user_id),
+                )
+                .on_conflict_do_nothing(constraint="uq_user_post")
+                .returning(Like.post_id)
+            )
+        )
+
+    if to_unlike:
+        deltas.subtract(
+            await db.scalars(
+                delete(Like)
+                .filter(tuple_(Like.user_id, Like.post_id).in_(to_unlike))
+                .returning(Like.post_id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+
+    deltas = {post_id: delta for post_id, delta in deltas.items() if delta}
+
+    if deltas:
+        await db.execute(
+            bump_post_counter(
+                Post.like_count,
+                deltas,
+                trending_weight=settings.TRENDING_LIKE_WEIGHT,
+            )
+        )
+
+    await commit_and_invalidate(db, post_cache_keys(*deltas))
+    live_hub.add_likes(deltas)
+
+
+class LikeBuffer:
+    """
+    The class collects the like and unlike intents of the users in memory,
+    one per `(user_id, post_id)`, and writes them to the database in batches.
+    At most `flush_interval` seconds or `max_size` intents are lost
+    if the process dies between two flushes.
+    """
+
+    def __init__(self, flush_interval: float, max_size: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.intents: dict[tuple[int, int], bool] = {}
+        self.flushing: dict[tuple[int, int], bool] = {}
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.intents)
+
+    def liked(self, user_id: int, post_id: int, stored: bool) -> bool:
+        """
+        The method returns whether the user likes the `post`
+        once the pending intents are written over the `stored` state.
+        """
+        key = (user_id, post_id)
+
+        return self.intents.get(key, self.flushing.get(key, stored))
+
+    def pending_delta(self, user_id: int, post_id: int) -> int:
+        """
+        The method returns how the pending intents of the user,
+        including the one being flushed, will move the like counter
+        of the `post`. Every intent changes the state the user sees,
+        so an unlike pending behind a flushing like cancels it out.
+        """
+        key = (user_id, post_id)
+
+        return sum(
+            1 if liked else -1
+            for liked in (self.flushing.get(key), self.intents.get(key))
+            if liked is not None
+        )
+
+    def has_pending(self, user_id: int, post_ids: set[int]) -> bool:
+        """
+        The method returns whether the user has an intent pending
+        or being flushed for any of the `posts`.
+        """
+        return any(
+            (user_id, post_id) in self.intents
+            or (user_id, post_id) in self.flushing
+            for post_id in post_ids
+        )
+
+    def add(self, user_id: int, post_id: int, liked: bool) -> None:
+        """
+        The method records the intent of the user.
+        An intent opposite to the pending one cancels it.
+        """
+        key = (user_id, post_id)
+
+        if self.intents.get(key, liked) != liked:
+            del self.intents[key]
+        else:
+            self.intents[key] = liked
+
+    async def flush(self, db: AsyncSession) -> None:
+        """
+        The method writes the pending intents to the database.
+        The intents are kept for the next flush if the write fails.
+        """
+        async with self.lock:
+            if not self.intents:
+                return
+
+            self.flushing, self.intents = self.intents, {}
+
+            try:
+                await write_like_intents(db, self.flushing)
+            except BaseException:
+                self.intents = {**self.flushing, **self.intents}
+                raise
+            finally:
+                self.flushing = {}
+
+    async def drain(self) -> None:
+        """
+        The method flushes the pending intents in a session of its own.
+        """
+        async with session_scope() as db:
+            await self.flush(db)
+
+    async def run(self) -> None:
+        """
+        The method flushes the pending intents
+        every `flush_interval` seconds until it is cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Failed to flush the buffered likes.")
+
+    def clear(self) -> None:
+        """
+        The method forgets the pending intents.
+        """
+        self.intents = {}
+        self.flushing = {}
+
+
+like_buffer = LikeBuffer(
+    flush_interval=settings.LIKE_FLUSH_SECONDS,
+    max_size=settings.LIKE_BUFFER_MAX_SIZE,
+)
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, NamedTuple
+
+import orjson
+from sqlalchemy import Row
+
+from src.config import settings
+from src.models import Comment, User
+from src.schemas import CurrentUser
+from src.serializers import serialize_comment
+
+
+logger = logging.getLogger(__name__)
+
+
+class LiveEvent(NamedTuple):
+    """
+    An event serialized once for all subscribers:
+    as a WebSocket text frame and as a server-sent event.
+    """
+
+    text: str
+    sse: bytes
+
+
+class Subscriber:
+    """
+    The class queues the events for one live connection.
+    A subscriber whose queue is full is dropped instead of buffering more.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue: asyncio.Queue[LiveEvent | None] = asyncio.Queue(queue_size)
+        self.dropped = False
+
+    def send(self, event: LiveEvent) -> bool:
+        """
+        The method queues an `event` and returns whether there was room.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+
+        return True
+
+    def drop(self) -> None:
+        """
+        The method discards the queued events and wakes up the consumer.
+        """
+        self.dropped = True
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(None)
+
+    async def receive(self, timeout: float | None = None) -> LiveEvent | None:
+        """
+        The method returns the next event, or `None` once the subscriber
+        is dropped or when nothing arrives within `timeout` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveHub:
+    """
+    The class keeps the subscribers of every `post` in this process
+    and fans the events of the `post` out to them. The like count changes
+    are summed up and published once every `like_interval` seconds.
+    """
+
+    def __init__(self, queue_size: int, like_interval: float) -> None:
+        self.queue_size = queue_size
+        self.like_interval = like_interval
+        self.subscribers: dict[int, set[Subscriber]] = {}
+        self.like_deltas: dict[int, int] = {}
+        self.dropped = 0
+
+    @contextmanager
+    def subscribe(self, post_id: int) -> Iterator[Subscriber]:
+        """
+        The method registers a subscriber to the events of a `post`
+        for the duration of the context.
+        """
+        subscriber = Subscriber(self.queue_size)
+        self.subscribers.setdefault(post_id, set()).add(subscriber)
+
+        try:
+            yield subscriber
+        finally:
+            self.unsubscribe(post_id, subscriber)
+
+    def unsubscribe(self, post_id: int, subscriber: Subscriber) -> None:
+        """
+        The method removes a subscriber from the events of a `post`.
+        """
+        subscribers = self.subscribers.get(post_id, set())
+        subscribers.discard(subscriber)
+
+        if not subscribers:
+            self.subscribers.pop(post_id, None)
+
+    def publish(self, post_id: int, payload: dict[str, Any]) -> None:
+        """
+        The method serializes the `payload` once and queues it
+        for every subscriber of the `post`, dropping the ones
+        that do not keep up.
+        """
+        subscribers = self.subscribers.get(post_id)
+
+        if not subscribers:
+            return
+
+        data = orjson.dumps(payload)
+        event = LiveEvent(
+            text=data.decode(),
+            sse=b"event: %s\ndata: %s\n\n" % (payload["type"].encode(), data),
+        )
+
+        for subscriber in list(subscribers):
+            if not subscriber.send(event):
+                subscriber.drop()
+                self.unsubscribe(post_id, subscriber)
+                self.dropped += 1
+
+    def publish_comment(
+        self, comment: Comment | Row, author: User | CurrentUser | None = None
+    ) -> None:
+        """
+        The method publishes a new `comment` to the subscribers of its `post`.
+        """
+        if comment.post_id in self.subscribers:
+            self.publish(
+                comment.post_id,
+                {
+                    "type": "comment",
+                    "comment": serialize_comment(comment, author),
+                },
+            )
+
+    def add_likes(self, deltas: Mapping[int, int]) -> None:
+        """
+        The method adds the like count changes (`post_id` -> delta)
+        of the subscribed `posts` to the next like events.
+        """
+        for post_id, delta in deltas.items():
+            if post_id in self.subscribers:
+                self.like_deltas[post_id] = (
+                    self.like_deltas.get(post_id, 0) + delta
+                )
+
+    def flush_likes(self) -> None:
+        """
+        The method publishes one like event per changed `post`.
+        """
+        deltas, self.like_deltas = self.like_deltas, {}
+
+        for post_id, delta in deltas.items():
+            if delta:
+                self.publish(
+                    post_id,
+                    {"type": "likes", "post_id": post_id, "delta": delta},
+                )
+
+    async def run(self) -> None:
+        """
+        The method publishes the like events
+        every `like_interval` seconds until it is cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.like_interval)
+
+            try:
+                self.flush_likes()
+            except Exception:
+                logger.exception("Failed to publish the like events.")
+
+    def clear(self) -> None:
+        """
+        The method drops all subscribers and the pending like changes.
+        """
+        for subscribers in self.subscribers.values():
+            for subscriber in subscribers:
+                subscriber.drop()
+
+        self.subscribers = {}
+        self.like_deltas = {}
+
+
+live_hub = LiveHub(
+    queue_size=settings.LIVE_QUEUE_SIZE,
+    like_interval=settings.LIVE_LIKE_INTERVAL_SECONDS,
+)
@@ -1,9 +1,86 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from src.config import settings
+from src.database import replica_session_engine, session_engine
+from src.etags import ETAG_HEADER
+from src.invalidation import invalidation_listener
+from src.like_buffer import like_buffer
+from src.live import live_hub
+from src.pagination import NEXT_CURSOR_HEADER
+from src.pool import prewarm_pool
+from src.replica import ReadYourWritesMiddleware
+from src.routers import (
+    auth,
+    comment,
+    feed,
+    follow,
+    internal,
+    like,
+    live,
+    post,
+    user,
+)
+from src.trending import trending_board
+from src.utils import password_hasher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    The function prewarms the connection pools, starts the background tasks
+    of the application and releases the application resources on shutdown.
+    """
+    engines = [session_engine]
+
+    if replica_session_engine is not session_engine:
+        engines.append(replica_session_engine)
+
+    if settings.DATABASE_POOL_PREWARM:
+        for engine in engines:
+            await prewarm_pool(engine, settings.DATABASE_POOL_SIZE)
+
+    tasks = [
+        asyncio.create_task(trending_board.run()),
+        asyncio.create_task(live_hub.run()),
+    ]
 
-from src.routers import auth, comment, like, post, user
+    if settings.CACHE_INVALIDATION_NOTIFY:
+        tasks.append(asyncio.create_task(invalidation_listener.run()))
 
-app = FastAPI(title="SocialMedia")
+    if settings.LIKE_WRITE_BEHIND:
+        tasks.append(asyncio.create_task(like_buffer.run()))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await task
+
+    if settings.LIKE_WRITE_BEHIND:
+        await like_buffer.drain()
+
+    password_hasher.shutdown()
+
+    for engine in engines:
+        if settings.DATABASE_ASYNC:
+            await engine.dispose()
+        else:
+            engine.dispose()
+
+
+app = FastAPI(
+    title="SocialMedia",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 origins = ["*"]
 
@@ -13,17 +90,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[ETAG_HEADER, NEXT_CURSOR_HEADER],
 )
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.include_router(router=auth.router)
 app.include_router(router=comment.router)
+app.include_router(router=feed.router)
+app.include_router(router=follow.router)
+app.include_router(router=internal.router)
 app.include_router(router=like.router)
+app.include_router(router=live.router)
 app.include_router(router=post.router)
 app.include_router(router=user.router)
 
 
 @app.get("/", tags=["Root Endpoint"])
-def root() -> dict[str, str]:
+async def root() -> dict[str, str]:
     """
     A function is the root endpoint of an application.
     """
@@ -4,19 +4,25 @@ import sqlalchemy.types
 from sqlalchemy import (
     Boolean,
     Column,
+    Computed,
     DateTime,
+    Float,
     ForeignKey,
     func,
+    Index,
     Integer,
     String,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 
 Base = declarative_base()
 
+SEARCH_CONFIG = "english"
+
 
 class Category(str, Enum):
     BUSINESS = "BUSINESS"
@@ -46,6 +52,9 @@ class User(Base):
     phone_number = Column(String, nullable=True)
     country = Column(String, nullable=True)
     region = Column(String, nullable=True)
+    follower_count = Column(
+        Integer, server_default="0", index=True, nullable=False
+    )
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -59,6 +68,16 @@ class User(Base):
     posts = relationship("Post", back_populates="author")
     comments = relationship("Comment", back_populates="author")
     likes = relationship("Like", back_populates="user")
+    followers = relationship(
+        "Follow",
+        foreign_keys="Follow.followee_id",
+        back_populates="followee",
+    )
+    following = relationship(
+        "Follow",
+        foreign_keys="Follow.follower_id",
+        back_populates="follower",
+    )
 
     def __repr__(self) -> str:
         return (
@@ -76,6 +95,25 @@ class Post(Base):
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
     category = Column(sqlalchemy.types.Enum(Category), nullable=False)
+    like_count = Column(Integer, server_default="0", nullable=False)
+    comment_count = Column(Integer, server_default="0", nullable=False)
+    trending_score = Column(
+        Float, server_default="0", index=True, nullable=False
+    )
+    trending_decayed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    fanned_out = Column(Boolean, server_default="True", nullable=False)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', content), 'B')",
+                persisted=True,
+            ),
+        )
+    )
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -87,12 +125,37 @@ class Post(Base):
     )
 
     user_id = Column(
-        Integer, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        nullable=False,
     )
     author = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post")
     likes = relationship("Like", back_populates="post")
 
+    __table_args__ = (
+        Index("ix_post_created_at_post_id", "created_at", "post_id"),
+        Index(
+            "ix_post_category_created_at_post_id",
+            "category",
+            "created_at",
+            "post_id",
+        ),
+        # The index also serves the lookups of the `user_id` foreign key.
+        Index(
+            "ix_post_user_id_created_at_post_id",
+            "user_id",
+            "created_at",
+            "post_id",
+        ),
+        Index(
+            "ix_post_created_at_brin", "created_at", postgresql_using="brin"
+        ),
+        Index(
+            "ix_post_search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"Post(post_id={self.post_id}, created_at={self.created_at})"
 
@@ -116,11 +179,24 @@ class Comment(Base):
         Integer, ForeignKey("post.post_id", ondelete="CASCADE"), nullable=False
     )
     user_id = Column(
-        Integer, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
     )
     author = relationship("User", back_populates="comments")
     post = relationship("Post", back_populates="comments")
 
+    __table_args__ = (
+        Index("ix_comment_created_at_comment_id", "created_at", "comment_id"),
+        Index(
+            "ix_comment_post_id_created_at_comment_id",
+            "post_id",
+            "created_at",
+            "comment_id",
+        ),
+    )
+
     def __repr__(self) -> str:
         return (
             f"Comment(comment_id={self.comment_id}, "
@@ -144,6 +220,7 @@ class Like(Base):
     post_id = Column(
         Integer,
         ForeignKey("post.post_id", ondelete="CASCADE"),
+        index=True,
         nullable=False,
     )
     user = relationship("User", back_populates="likes")
@@ -155,3 +232,97 @@ class Like(Base):
 
     def __repr__(self) -> str:
         return f"Like(like_id={self.like_id}, created_at={self.created_at})"
+
+
+class Follow(Base):
+    __tablename__ = "follow"
+
+    follow_id = Column(Integer, primary_key=True, index=True, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    follower_id = Column(
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    followee_id = Column(
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    follower = relationship(
+        "User", foreign_keys=[follower_id], back_populates="following"
+    )
+    followee = relationship(
+        "User", foreign_keys=[followee_id], back_populates="followers"
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "follower_id", "followee_id", name="uq_follower_followee"
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"Follow(follower_id={self.follower_id}, "
+            f"followee_id={self.followee_id})"
+        )
+
+
+class Timeline(Base):
+    __tablename__ = "timeline"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    post_id = Column(
+        Integer,
+        ForeignKey("post.post_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_timeline_user_id_created_at_post_id",
+            "user_id",
+            "created_at",
+            "post_id",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"Timeline(user_id={self.user_id}, post_id={self.post_id})"
+
+
+class PulledAuthor(Base):
+    __tablename__ = "pulled_author"
+
+    follower_id = Column(
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    author_id = Column(
+        Integer,
+        ForeignKey("user.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"PulledAuthor(follower_id={self.follower_id}, "
+            f"author_id={self.author_id})"
+        )
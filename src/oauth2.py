@@ -4,29 +4,64 @@ from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import TTLCache
 from src.config import settings
-from src.database import get_db
+from src.database import get_session
 from src.models import User
-from src.schemas import TokenPayload
+from src.schemas import CurrentUser, TokenPayload
 
 OAUTH2_SCHEMA = OAuth2PasswordBearer(tokenUrl="login")
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES = (
+    settings.STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES
+)
 
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
-def create_access_token(payload: dict) -> str:
+
+def invalidate_user(user_id: int) -> None:
+    """
+    The function removes the `user` from the cache of authenticated users.
+    It must be called whenever the `user` is changed or deactivated.
+    """
+    user_cache.delete(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_user_on_flush(mapper, connection, target: User) -> None:
+    """
+    The function invalidates the cached `user` when it is updated
+    or deleted through the ORM. Bulk `UPDATE` and `DELETE` statements
+    bypass this hook and must call `invalidate_user` explicitly.
+    """
+    invalidate_user(target.user_id)
+
+
+def create_access_token(payload: dict, user: CurrentUser | None = None) -> str:
     """
     The function creates an `access_token` for the authenticated user.
+    When the `user` is passed, its summary is embedded in the token
+    and the token gets the short stateless lifetime.
     """
     to_encode = payload.copy()
+    expire_minutes = ACCESS_TOKEN_EXPIRE_MINUTES
 
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if user is not None:
+        to_encode.update(user.dict())
+        expire_minutes = STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES
+
+    expire = datetime.utcnow() + timedelta(minutes=expire_minutes)
     expire_str = expire.isoformat()
     expire_json = json.dumps(expire_str)
-    to_encode.update({"expiration_time": expire_json})
+    to_encode.update({"expiration_time": expire_json, "exp": expire})
 
     encoded_jwt = jwt.encode(
         claims=to_encode, key=SECRET_KEY, algorithm=ALGORITHM
@@ -50,18 +85,21 @@ def verify_access_token(
         if not user_id:
             raise credentials_exception
 
-        token_payload = TokenPayload(user_id=user_id)
+        token_payload = TokenPayload(**payload)
     except JWTError:
         raise credentials_exception
 
     return token_payload
 
 
-def get_current_user(
-    token: str = Depends(OAUTH2_SCHEMA), db: Session = Depends(get_db)
-) -> TokenPayload:
+async def get_current_user(
+    token: str = Depends(OAUTH2_SCHEMA),
+    db: AsyncSession = Depends(get_session),
+) -> CurrentUser:
     """
     The function returns a `user` that has the correct `payload` data.
+    In the stateless mode the `user` is built from the token claims,
+    otherwise it is served from the in-process cache when possible.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,6 +110,23 @@ def get_current_user(
     access_token = verify_access_token(
         token=token, credentials_exception=credentials_exception
     )
-    user = db.query(User).filter(User.user_id == access_token.user_id).first()
+    if settings.AUTH_STATELESS and access_token.is_active is not None:
+        user = CurrentUser(**access_token.dict())
+    else:
+        user = user_cache.get(access_token.user_id)
+
+    if user is None:
+        db_user = await db.scalar(
+            select(User).filter(User.user_id == access_token.user_id)
+        )
+
+        if not db_user:
+            raise credentials_exception
+
+        user = CurrentUser.from_orm(db_user)
+        user_cache.set(user.user_id, user)
+
+    if not user.is_active:
+        raise credentials_exception
 
     return user
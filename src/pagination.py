@@ -0,0 +1,80 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import Column, ColumnElement, Select, tuple_
+
+from src.exceptions import CursorFormatException
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position: datetime | float, key: int) -> str:
+    """
+    The function converts the position of the last returned row
+    (its creation time or its search rank) to an opaque `cursor` string.
+    """
+    if isinstance(position, datetime):
+        position = position.isoformat()
+
+    raw = json.dumps([position, key]).encode()
+
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(
+    cursor: str, position_type: type[datetime] | type[float]
+) -> tuple[datetime | float, int]:
+    """
+    The function converts an opaque `cursor` string back
+    to the position of the last returned row, which must be
+    of the `position_type` of the column the rows are ordered by.
+    """
+    try:
+        position, key = json.loads(base64.urlsafe_b64decode(cursor))
+
+        if type(key) is not int:
+            raise TypeError
+
+        if position_type is datetime and isinstance(position, str):
+            return datetime.fromisoformat(position), key
+
+        if position_type is float and type(position) in (int, float):
+            return float(position), key
+
+        raise TypeError
+    except (binascii.Error, TypeError, ValueError):
+        raise CursorFormatException(detail="The `after` cursor is invalid.")
+
+
+def paginate(
+    query: Select,
+    position: ColumnElement,
+    key: Column,
+    after: str | None,
+    offset: int,
+    limit: int,
+    newest_first: bool = True,
+) -> Select:
+    """
+    The function orders the `query` by `(position, key)`, from the newest
+    (or highest ranked) to the oldest row or the other way round,
+    and applies either keyset pagination (when the `after` cursor is given)
+    or offset pagination.
+    """
+    row = tuple_(position, key)
+
+    if newest_first:
+        query = query.order_by(position.desc(), key.desc())
+    else:
+        query = query.order_by(position, key)
+
+    if after:
+        cursor = tuple_(*decode_cursor(after, position.type.python_type))
+        query = query.filter(row < cursor if newest_first else row > cursor)
+    else:
+        query = query.offset(offset)
+
+    return query.limit(limit)
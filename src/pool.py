@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+from starlette.concurrency import run_in_threadpool
+
+
+logger = logging.getLogger(__name__)
+
+
+class MeasuredPoolMixin:
+    """
+    The mixin counts the checkouts of a queue pool and measures
+    how long each of them waits for a connection, including the time
+    needed to open a new one and to pre-ping it.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+
+        wait = time.perf_counter() - started_at
+
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+        return connection
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        The method returns the connection counts of the pool
+        and the checkout wait statistics in seconds.
+        """
+        with self._stats_lock:
+            checkouts = self.checkouts or 1
+
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg": self.wait_total / checkouts,
+                "wait_max": self.wait_max,
+            }
+
+
+class MeasuredQueuePool(MeasuredPoolMixin, QueuePool):
+    pass
+
+
+class MeasuredAsyncAdaptedQueuePool(MeasuredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+async def prewarm_pool(engine: Engine | AsyncEngine, size: int) -> None:
+    """
+    The function opens `size` connections of the `engine` pool,
+    concurrently for an async engine and one after another
+    in a worker thread otherwise, and returns them to the pool together,
+    so the first requests after startup do not wait for new connections.
+    A failure is only logged, since the pool opens the connections
+    on demand anyway.
+    """
+    try:
+        if isinstance(engine, AsyncEngine):
+            async with AsyncExitStack() as stack:
+                await asyncio.gather(
+                    *(
+                        stack.enter_async_context(engine.connect())
+                        for _ in range(size)
+                    )
+                )
+        else:
+
+            def connect() -> None:
+                with ExitStack() as stack:
+                    for _ in range(size):
+                        stack.enter_context(engine.connect())
+
+            await run_in_threadpool(connect)
+    except Exception:
+        logger.exception("Failed to prewarm the connection pool.")
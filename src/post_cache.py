@@ -0,0 +1,73 @@
+from src.cache import create_cache_backend
+
+
+FIRST_PAGE_KEY = "posts:first-page"
+
+post_cache = create_cache_backend()
+
+
+class CacheGeneration:
+    """
+    The class counts the invalidations of the `post_cache`
+    seen by this worker, so a fill can tell whether its rows
+    may have been read before one of them.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def bump(self) -> None:
+        """
+        The method records an invalidation.
+        """
+        self.value += 1
+
+
+post_cache_generation = CacheGeneration()
+
+
+def post_key(post_id: int) -> str:
+    """
+    The function returns the cache key of a single `post`.
+    """
+    return f"post:{post_id}"
+
+
+def pack_response(etag: str, body: bytes) -> bytes:
+    """
+    The function joins the `ETag` and the body of a response
+    into a single cache entry.
+    """
+    return etag.encode() + b"\n" + body
+
+
+def unpack_response(entry: bytes) -> tuple[str, bytes]:
+    """
+    The function splits a cache entry into the `ETag`
+    and the body of a response.
+    """
+    etag, body = entry.split(b"\n", 1)
+
+    return etag.decode(), body
+
+
+async def fill_post_cache(
+    key: str, value: bytes, ttl: float, generation: int
+) -> None:
+    """
+    The function stores an entry read while the cache was at `generation`
+    and removes it again if the cache was invalidated since then,
+    so rows read before a concurrent commit do not outlive it.
+    """
+    await post_cache.set(key, value, ttl=ttl)
+
+    if post_cache_generation.value != generation:
+        await post_cache.delete(key)
+
+
+def post_cache_keys(*post_ids: int) -> list[str]:
+    """
+    The function returns the cache keys to invalidate after a committed
+    change of the `posts`, of their counters or of the set of `posts`.
+    """
+    return [FIRST_PAGE_KEY, *map(post_key, post_ids)]
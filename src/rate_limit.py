@@ -0,0 +1,136 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+from fastapi import Request
+
+from src.config import settings
+from src.exceptions import TooManyRequestsException
+
+
+class TokenBucketBackend(ABC):
+    """
+    The interface of a storage that keeps the token buckets.
+    A shared implementation (e.g. Redis) lets several workers
+    enforce a common limit.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        """
+        The method takes one token from the bucket under the `key`
+        and returns `0` on success or the number of seconds
+        until a token becomes available.
+        """
+
+
+class InMemoryTokenBucketBackend(TokenBucketBackend):
+    """
+    A token bucket storage kept in the memory of a single worker.
+    The least recently used buckets are dropped when it is full.
+    """
+
+    def __init__(
+        self, maxsize: int, timer: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self.timer = timer
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        with self._lock:
+            now = self.timer()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+            return retry_after
+
+    def clear(self) -> None:
+        """
+        The method removes all buckets.
+        """
+        with self._lock:
+            self._buckets.clear()
+
+
+class TokenBucketLimiter:
+    """
+    The class limits the number of requests per identifier
+    with a token bucket of `capacity` tokens refilled `per_minute`.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        capacity: int,
+        per_minute: float,
+        backend: TokenBucketBackend,
+    ) -> None:
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60
+        self.backend = backend
+
+    async def hit(self, identifier: str) -> None:
+        """
+        The method consumes a token for the `identifier` or raises
+        `TooManyRequestsException` if the bucket is empty.
+        """
+        retry_after = await self.backend.take(
+            key=f"{self.scope}:{identifier}",
+            capacity=self.capacity,
+            refill_rate=self.refill_rate,
+        )
+
+        if retry_after:
+            raise TooManyRequestsException(
+                detail="Too many attempts, try again later.",
+                retry_after=math.ceil(retry_after),
+            )
+
+
+rate_limit_backend = InMemoryTokenBucketBackend(
+    maxsize=settings.RATE_LIMIT_MAX_BUCKETS
+)
+
+ip_limiter = TokenBucketLimiter(
+    scope="ip",
+    capacity=settings.PASSWORD_RATE_LIMIT_IP_BURST,
+    per_minute=settings.PASSWORD_RATE_LIMIT_IP_PER_MINUTE,
+    backend=rate_limit_backend,
+)
+
+account_limiter = TokenBucketLimiter(
+    scope="account",
+    capacity=settings.PASSWORD_RATE_LIMIT_ACCOUNT_BURST,
+    per_minute=settings.PASSWORD_RATE_LIMIT_ACCOUNT_PER_MINUTE,
+    backend=rate_limit_backend,
+)
+
+
+async def limit_password_attempts(request: Request, account: str) -> None:
+    """
+    The function admits a password operation only if both the client IP
+    and the `account` have tokens left, so that bcrypt capacity
+    is not spent on credential-stuffing traffic.
+    """
+    client_host = request.client.host if request.client else "unknown"
+
+    await ip_limiter.hit(client_host)
+    await account_limiter.hit(account.lower())
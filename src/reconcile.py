@@ -0,0 +1,62 @@
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from src.counters import update_post_counters, update_user_counters
+from src.database import SessionLocal
+from src.models import Comment, Follow, Like, Post, User
+
+
+def reconcile_post_counters(db: Session) -> int:
+    """
+    The function recalculates `like_count` and `comment_count`
+    of every `post` whose counters drifted from the `like` and `comment`
+    tables and returns the number of repaired `posts`.
+    """
+    likes = (
+        select(func.count())
+        .where(Like.post_id == Post.post_id)
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.count())
+        .where(Comment.post_id == Post.post_id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update_post_counters()
+        .where(or_(Post.like_count != likes, Post.comment_count != comments))
+        .values(like_count=likes, comment_count=comments)
+    )
+    db.commit()
+
+    return result.rowcount
+
+
+def reconcile_follower_counters(db: Session) -> int:
+    """
+    The function recalculates `follower_count` of every `user`
+    whose counter drifted from the `follow` table
+    and returns the number of repaired `users`.
+    """
+    followers = (
+        select(func.count())
+        .where(Follow.followee_id == User.user_id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update_user_counters()
+        .where(User.follower_count != followers)
+        .values(follower_count=followers)
+    )
+    db.commit()
+
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    with SessionLocal() as session:
+        repaired_posts = reconcile_post_counters(session)
+        repaired_users = reconcile_follower_counters(session)
+
+    print(f"Repaired counters of {repaired_posts} post(s).")
+    print(f"Repaired counters of {repaired_users} user(s).")
@@ -0,0 +1,143 @@
+from enum import Enum
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.cache import create_cache_backend
+from src.config import settings
+from src.database import get_replica_session, get_session
+from src.oauth2 import verify_access_token
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadTarget(str, Enum):
+    """
+    The database a read is sent to. The shared caches are filled
+    only from the primary database and skipped by the sticky reads.
+    """
+
+    PRIMARY = "PRIMARY"
+    REPLICA = "REPLICA"
+    STICKY_PRIMARY = "STICKY_PRIMARY"
+
+    @property
+    def reads_cache(self) -> bool:
+        """
+        The property tells whether the cached responses may be served.
+        """
+        return self is not ReadTarget.STICKY_PRIMARY
+
+    @property
+    def fills_cache(self) -> bool:
+        """
+        The property tells whether the rows read may be cached.
+        """
+        return self is not ReadTarget.REPLICA
+
+
+recent_writers = create_cache_backend()
+
+
+def writer_key(user_id: int) -> str:
+    """
+    The function returns the cache key that marks a recent write of a `user`.
+    """
+    return f"writer:{user_id}"
+
+
+def get_token_user_id(headers: Headers) -> int | None:
+    """
+    The function returns the `user_id` of the bearer token
+    of a request without looking the `user` up,
+    or `None` if the request has no valid token.
+    """
+    scheme, _, token = headers.get("Authorization", "").partition(" ")
+
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return verify_access_token(
+            token=token, credentials_exception=HTTPException(status_code=401)
+        ).user_id
+    except HTTPException:
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    The middleware marks the `user` of every successful write request
+    for `READ_YOUR_WRITES_SECONDS` seconds, before the response is sent,
+    so `get_read_db` keeps the reads of the `user` on the primary database
+    until the replica has caught up.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not settings.POSTGRES_REPLICA_HOST
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        user_id = get_token_user_id(Headers(scope=scope))
+
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_marking(message: Message) -> None:
+            if message["type"] == "http.response.start" and (
+                message["status"] < 400
+            ):
+                await recent_writers.set(
+                    writer_key(user_id),
+                    b"1",
+                    ttl=settings.READ_YOUR_WRITES_SECONDS,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_after_marking)
+
+
+async def get_read_target(request: Request) -> ReadTarget:
+    """
+    The function returns the database the reads of a request are sent to:
+    the primary database if no replica is configured, the replica,
+    or the primary database again while the `user` of the request
+    has written within the last `READ_YOUR_WRITES_SECONDS` seconds.
+    """
+    if not settings.POSTGRES_REPLICA_HOST:
+        return ReadTarget.PRIMARY
+
+    user_id = get_token_user_id(request.headers)
+
+    if user_id is not None and await recent_writers.get(writer_key(user_id)):
+        return ReadTarget.STICKY_PRIMARY
+
+    return ReadTarget.REPLICA
+
+
+async def get_read_db(
+    target: ReadTarget = Depends(get_read_target),
+    db: AsyncSession = Depends(get_session),
+    replica_db: AsyncSession = Depends(get_replica_session),
+) -> AsyncSession:
+    """
+    The function returns the session database of the `target` of the reads,
+    so the `user` sees their own writes despite the replication lag.
+    """
+    if target is ReadTarget.REPLICA:
+        return replica_db
+
+    return db
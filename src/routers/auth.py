@@ -1,26 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.config import settings
+from src.database import get_session
 from src.models import User
 from src.oauth2 import create_access_token
-from src.schemas import Token
-from src.utils import verify_password
+from src.rate_limit import limit_password_attempts
+from src.schemas import CurrentUser, Token
+from src.utils import password_hasher
 
 router = APIRouter(tags=["Authentication Endpoint"])
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     user_credentials: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
 ) -> Token:
     """
     The function creates an `access_token` for the authenticated user.
     """
-    user = (
-        db.query(User).filter(User.email == user_credentials.username).first()
+    await limit_password_attempts(request, user_credentials.username)
+
+    user = await db.scalar(
+        select(User).filter(User.email == user_credentials.username)
     )
 
     if not user:
@@ -29,12 +35,17 @@ def login(
             detail="Invalid Credentials.",
         )
 
-    if not verify_password(user_credentials.password, user.password):
+    if not await password_hasher.verify(
+        user_credentials.password, user.password
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid Credentials.",
         )
 
-    access_token = create_access_token(payload={"user_id": user.user_id})
+    access_token = create_access_token(
+        payload={"user_id": user.user_id},
+        user=CurrentUser.from_orm(user) if settings.AUTH_STATELESS else None,
+    )
 
     return Token(access_token=access_token, token_type="bearer")
@@ -1,41 +1,317 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections import Counter
 
-from src.database import get_db
-from src.models import Comment
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.config import settings
+from src.counters import bump_post_counter, update_post_counters
+from src.database import get_session
+from src.etags import (
+    COMMENT_VERSION_COLUMNS,
+    comment_version,
+    ETAG_HEADER,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from src.models import Comment, Post, User
 from src.oauth2 import get_current_user
-from src.schemas import CommentResponse, CommentCreate, CommentUpdate
+from src.invalidation import commit_and_invalidate
+from src.live import live_hub
+from src.post_cache import post_cache_keys
+from src.pagination import NEXT_CURSOR_HEADER, encode_cursor, paginate
+from src.replica import get_read_db
+from src.schemas import (
+    BatchDelete,
+    BatchItemResult,
+    CommentBatchCreate,
+    CommentResponse,
+    CommentCreate,
+    CommentUpdate,
+)
+from src.serializers import serialize_comment
+from src.trending import bump_trending_score
 
 router = APIRouter(prefix="/comments", tags=["Comment Endpoints"])
 
 
+async def raise_comment_write_error(
+    db: AsyncSession,
+    comment_id: int,
+    user_id: int,
+    post_id: int | None = None,
+) -> None:
+    """
+    The function explains why an ownership-checked write
+    did not match the `comment` or the `post` it is moved to.
+    """
+    author_id = await db.scalar(
+        select(Comment.user_id).filter(Comment.comment_id == comment_id)
+    )
+
+    if not author_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Comment with comment_id: {comment_id} does not exist.",
+        )
+
+    if author_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform request action.",
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Post with post_id: {post_id} does not exist."
+        if post_id is not None
+        else f"Comment with comment_id: {comment_id} does not exist.",
+    )
+
+
 @router.get("/", response_model=list[CommentResponse])
-def get_comments(
-    db: Session = Depends(get_db),
-    offset: int = 0,
-    limit: int = 10,
+async def get_comments(
+    db: AsyncSession = Depends(get_read_db),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: str | None = None,
+    if_none_match: str | None = Header(default=None),
     current_user: int = Depends(get_current_user),
 ) -> list[CommentResponse]:
     """
     The function returns a list of `comments` from the database,
     with optional pagination parameters to limit the number of `comments` returned.
+    The cursor of the next page is returned in the `X-Next-Cursor` header.
+    The page has a weak `ETag`, and a matching `If-None-Match`
+    is answered with `304 Not Modified` without serializing the rows.
+    The rows are serialized directly, without re-validating them
+    against the response model.
+    """
+    comments_query = paginate(
+        query=select(Comment).options(joinedload(Comment.author)),
+        position=Comment.created_at,
+        key=Comment.comment_id,
+        after=after,
+        offset=offset,
+        limit=limit,
+    )
+    comments = (await db.scalars(comments_query)).all()
+    headers = {}
+
+    if comments and len(comments) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            comments[-1].created_at, comments[-1].comment_id
+        )
+
+    headers[ETAG_HEADER] = make_etag(
+        *[comment_version(comment) for comment in comments], weak=True
+    )
+
+    if etag_matches(if_none_match, headers[ETAG_HEADER]):
+        return not_modified(headers[ETAG_HEADER], headers)
+
+    return ORJSONResponse(
+        content=[serialize_comment(comment) for comment in comments],
+        headers=headers,
+    )
+
+
+@router.post("/batch", response_model=list[BatchItemResult])
+async def create_comments(
+    comments: CommentBatchCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+) -> list[BatchItemResult]:
+    """
+    The function creates several `comments` with a single statement
+    in one transaction and returns the result of every item.
+    """
+    existing_posts = set(
+        await db.scalars(
+            select(Post.post_id)
+            .filter(
+                Post.post_id.in_({comment.post_id for comment in comments})
+            )
+            .with_for_update(key_share=True)
+        )
+    )
+    accepted = [
+        (index, comment)
+        for index, comment in enumerate(comments)
+        if comment.post_id in existing_posts
+    ]
+    comment_ids = {}
+    inserted = []
+
+    if accepted:
+        inserted = (
+            await db.execute(
+                insert(Comment.__table__)
+                .values(
+                    [
+                        {"user_id": current_user.user_id, **comment.dict()}
+                        for _, comment in accepted
+                    ]
+                )
+                .returning(*Comment.__table__.c)
+            )
+        ).all()
+        comment_ids = dict(
+            zip(
+                (index for index, _ in accepted),
+                (new_comment.comment_id for new_comment in inserted),
+            )
+        )
+        await db.execute(
+            bump_post_counter(
+                Post.comment_count,
+                Counter(comment.post_id for _, comment in accepted),
+                trending_weight=settings.TRENDING_COMMENT_WEIGHT,
+            )
+        )
+
+    await commit_and_invalidate(
+        db, post_cache_keys(*{comment.post_id for _, comment in accepted})
+    )
+
+    for new_comment in inserted:
+        live_hub.publish_comment(new_comment, current_user)
+
+    return [
+        BatchItemResult(
+            index=index,
+            status_code=status.HTTP_201_CREATED,
+            id=comment_ids[index],
+        )
+        if index in comment_ids
+        else BatchItemResult(
+            index=index,
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with post_id: {comment.post_id} does not exist.",
+        )
+        for index, comment in enumerate(comments)
+    ]
+
+
+@router.delete("/batch", response_model=list[BatchItemResult])
+async def delete_comments(
+    comment_ids: BatchDelete = Body(),
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+) -> list[BatchItemResult]:
+    """
+    The function deletes several `comments` of the current user
+    with a single statement and returns the result of every item.
     """
-    comments = db.query(Comment).limit(limit=limit).offset(offset=offset).all()
+    deleted = (
+        await db.execute(
+            delete(Comment)
+            .filter(
+                Comment.comment_id.in_(comment_ids),
+                Comment.user_id == current_user.user_id,
+            )
+            .returning(Comment.comment_id, Comment.post_id)
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+    deleted_ids = {comment.comment_id for comment in deleted}
+    not_deleted = set(comment_ids) - deleted_ids
+    foreign = set()
+
+    if deleted:
+        removed = Counter(comment.post_id for comment in deleted)
+        await db.execute(
+            bump_post_counter(
+                Post.comment_count,
+                {post_id: -count for post_id, count in removed.items()},
+                trending_weight=settings.TRENDING_COMMENT_WEIGHT,
+            )
+        )
+
+    if not_deleted:
+        foreign = set(
+            await db.scalars(
+                select(Comment.comment_id).filter(
+                    Comment.comment_id.in_(not_deleted)
+                )
+            )
+        )
+
+    await commit_and_invalidate(
+        db, post_cache_keys(*{comment.post_id for comment in deleted})
+    )
 
-    return comments
+    results = []
+
+    for index, comment_id in enumerate(comment_ids):
+        if comment_id in deleted_ids:
+            result = BatchItemResult(
+                index=index,
+                status_code=status.HTTP_204_NO_CONTENT,
+                id=comment_id,
+            )
+        elif comment_id in foreign:
+            result = BatchItemResult(
+                index=index,
+                status_code=status.HTTP_403_FORBIDDEN,
+                id=comment_id,
+                detail="Not authorized to perform request action.",
+            )
+        else:
+            result = BatchItemResult(
+                index=index,
+                status_code=status.HTTP_404_NOT_FOUND,
+                id=comment_id,
+                detail=f"Comment with comment_id: {comment_id} does not exist.",
+            )
+        results.append(result)
+
+    return results
 
 
 @router.get("/{comment_id}", response_model=CommentResponse)
-def get_comment(
+async def get_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: str | None = Header(default=None),
     current_user: int = Depends(get_current_user),
 ) -> CommentResponse:
     """
-    The function returns a single `comment` from the database.
+    The function returns a single `comment` from the database
+    with a strong `ETag` derived from its `updated_at`.
+    A matching `If-None-Match` is answered with `304 Not Modified`
+    after looking up only this column.
     """
-    comment = (
-        db.query(Comment).filter(Comment.comment_id == comment_id).first()
+    if if_none_match:
+        version = (
+            await db.execute(
+                select(*COMMENT_VERSION_COLUMNS)
+                .join(User, User.user_id == Comment.user_id)
+                .filter(Comment.comment_id == comment_id)
+            )
+        ).first()
+
+        if version:
+            etag = make_etag(*version)
+
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    comment = await db.scalar(
+        select(Comment)
+        .options(joinedload(Comment.author))
+        .filter(Comment.comment_id == comment_id)
     )
 
     if not comment:
@@ -44,82 +320,144 @@ def get_comment(
             detail=f"Comment with comment_id: {comment_id} does not exist.",
         )
 
-    return comment
+    return ORJSONResponse(
+        content=serialize_comment(comment),
+        headers={ETAG_HEADER: make_etag(*comment_version(comment))},
+    )
 
 
 @router.post(
     "/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED
 )
-def create_comment(
+async def create_comment(
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> CommentResponse:
     """
-    The function creates a new `comment` in the database.
+    The function creates a new `comment` in the database
+    and moves the counter and the trending score of the `post`.
     """
+    updated_posts = await db.execute(
+        update_post_counters()
+        .filter(Post.post_id == comment.post_id)
+        .values(
+            {
+                Post.comment_count: Post.comment_count + 1,
+                **bump_trending_score(settings.TRENDING_COMMENT_WEIGHT),
+            }
+        )
+    )
+
+    if not updated_posts.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with post_id: {comment.post_id} does not exist.",
+        )
+
     new_comment = Comment(user_id=current_user.user_id, **comment.dict())
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await commit_and_invalidate(db, post_cache_keys(comment.post_id))
+
+    new_comment = await db.scalar(
+        select(Comment)
+        .options(joinedload(Comment.author))
+        .filter(Comment.comment_id == new_comment.comment_id)
+        .execution_options(populate_existing=True)
+    )
+    live_hub.publish_comment(new_comment)
 
     return new_comment
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
-def update_comment(
+async def update_comment(
     comment_id: int,
     comment: CommentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> CommentResponse:
     """
     The function updates an existing `comment` in the database.
     """
-    comment_query = db.query(Comment).filter(Comment.comment_id == comment_id)
-    updated_comment = comment_query.first()
+    previous = (
+        select(Comment.comment_id, Comment.post_id)
+        .filter(Comment.comment_id == comment_id)
+        .with_for_update()
+        .subquery()
+    )
+    updated = (
+        await db.execute(
+            update(Comment.__table__)
+            .filter(
+                Comment.comment_id == previous.c.comment_id,
+                Comment.user_id == current_user.user_id,
+                select(Post.post_id)
+                .filter(Post.post_id == comment.post_id)
+                .exists(),
+            )
+            .values(**comment.dict())
+            .returning(
+                *Comment.__table__.c,
+                previous.c.post_id.label("previous_post_id"),
+            )
+        )
+    ).first()
 
-    if not updated_comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Comment with comment_id: {comment_id} does not exist.",
+    if not updated:
+        await raise_comment_write_error(
+            db, comment_id, current_user.user_id, comment.post_id
         )
 
-    if updated_comment.user_id != current_user.user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to perform request action.",
+    if updated.post_id != updated.previous_post_id:
+        await db.execute(
+            bump_post_counter(
+                Post.comment_count,
+                {updated.post_id: 1, updated.previous_post_id: -1},
+                trending_weight=settings.TRENDING_COMMENT_WEIGHT,
+            )
         )
 
-    comment_query.update(comment.dict(), synchronize_session=False)
-    db.commit()
+    await commit_and_invalidate(
+        db, post_cache_keys(updated.post_id, updated.previous_post_id)
+    )
 
-    return comment_query.first()
+    return serialize_comment(updated, author=current_user)
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_comment(
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> None:
     """
-    The function deletes an existing `comment` in the database.
+    The function deletes an existing `comment` in the database
+    and moves the counter and the trending score of its `post`
+    back in the same statement.
     """
-    comment_query = db.query(Comment).filter(Comment.comment_id == comment_id)
-    comment = comment_query.first()
-
-    if not comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Comment with comment_id: {comment_id} does not exist.",
+    deleted = (
+        delete(Comment.__table__)
+        .filter(
+            Comment.comment_id == comment_id,
+            Comment.user_id == current_user.user_id,
         )
-
-    if comment.user_id != current_user.user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to perform request action.",
+        .returning(Comment.post_id)
+        .cte("deleted_comment")
+    )
+    post_id = await db.scalar(
+        update_post_counters()
+        .filter(Post.post_id == deleted.c.post_id)
+        .values(
+            {
+                Post.comment_count: Post.comment_count - 1,
+                **bump_trending_score(-settings.TRENDING_COMMENT_WEIGHT),
+            }
         )
+        .returning(Post.post_id)
+    )
+
+    if not post_id:
+        await raise_comment_write_error(db, comment_id, current_user.user_id)
 
-    comment_query.delete(synchronize_session=False)
-    db.commit()
+    await commit_and_invalidate(db, post_cache_keys(post_id))
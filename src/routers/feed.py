@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import get_session
+from src.feed import build_feed_query
+from src.oauth2 import get_current_user
+from src.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from src.schemas import PostLikeCommentResponse
+from src.serializers import serialize_post_row
+
+router = APIRouter(prefix="/feed", tags=["Feed Endpoint"])
+
+
+@router.get("/", response_model=list[PostLikeCommentResponse])
+async def get_feed(
+    db: AsyncSession = Depends(get_session),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: str | None = None,
+    current_user: int = Depends(get_current_user),
+) -> list[PostLikeCommentResponse]:
+    """
+    The function returns the home timeline of the current user:
+    their own `posts` and the `posts` of the users they follow,
+    from the newest to the oldest one.
+    The cursor of the next page is returned in the `X-Next-Cursor` header.
+    """
+    posts = (
+        await db.execute(
+            build_feed_query(current_user.user_id, after=after, limit=limit)
+        )
+    ).all()
+    headers = {}
+
+    if posts and len(posts) == limit:
+        last_post = posts[-1].Post
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last_post.created_at, last_post.post_id
+        )
+
+    return ORJSONResponse(
+        content=[serialize_post_row(post) for post in posts], headers=headers
+    )
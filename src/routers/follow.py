@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.counters import update_user_counters
+from src.database import get_session
+from src.feed import (
+    add_pulled_authors,
+    backfill_timeline,
+    prune_timeline,
+    remove_pulled_author,
+)
+from src.models import Follow, User
+from src.oauth2 import get_current_user
+from src.schemas import FollowBase
+
+router = APIRouter(prefix="/follows", tags=["Follow Endpoint"])
+
+
+async def raise_follow_error(
+    db: AsyncSession, follow: FollowBase, user_id: int
+) -> None:
+    """
+    The function explains why a `follow` could not be added or deleted.
+    """
+    if follow.followee_id == user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You cannot follow yourself.",
+        )
+
+    if not await db.scalar(
+        select(User.user_id).filter(User.user_id == follow.followee_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with user_id: {follow.followee_id} does not exist.",
+        )
+
+    if follow.followed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"User with user_id: {user_id} "
+            f"already follows user with user_id: {follow.followee_id}.",
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Follow does not exist.",
+    )
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def follow_user(
+    follow: FollowBase,
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+):
+    """
+    The function creates or deletes an existing `follow`,
+    moves the follower counter of the followed `user`
+    and updates the timeline and the pulled authors of the current user.
+    """
+    if follow.followed:
+        changed = (
+            insert(Follow.__table__)
+            .from_select(
+                ["follower_id", "followee_id"],
+                select(literal(current_user.user_id), User.user_id).filter(
+                    User.user_id == follow.followee_id,
+                    User.user_id != current_user.user_id,
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uq_follower_followee")
+            .returning(Follow.followee_id)
+            .cte("inserted_follow")
+        )
+        delta = 1
+    else:
+        changed = (
+            delete(Follow.__table__)
+            .filter(
+                Follow.follower_id == current_user.user_id,
+                Follow.followee_id == follow.followee_id,
+            )
+            .returning(Follow.followee_id)
+            .cte("deleted_follow")
+        )
+        delta = -1
+
+    followee_id = await db.scalar(
+        update_user_counters()
+        .filter(User.user_id == changed.c.followee_id)
+        .values(follower_count=User.follower_count + delta)
+        .returning(User.user_id)
+    )
+
+    if not followee_id:
+        await raise_follow_error(db, follow, current_user.user_id)
+
+    if follow.followed:
+        await db.execute(
+            backfill_timeline(current_user.user_id, follow.followee_id)
+        )
+        await db.execute(
+            add_pulled_authors(current_user.user_id, follow.followee_id)
+        )
+        await db.commit()
+
+        return {"detail": "Successfully followed user."}
+
+    await db.execute(prune_timeline(current_user.user_id, follow.followee_id))
+    await db.execute(
+        remove_pulled_author(current_user.user_id, follow.followee_id)
+    )
+    await db.commit()
+
+    return {"detail": "Successfully unfollowed user."}
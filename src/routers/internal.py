@@ -0,0 +1,46 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.config import settings
+from src.database import replica_session_engine, session_engine
+from src.utils import password_hasher
+
+router = APIRouter(prefix="/internal", include_in_schema=False)
+
+
+def check_internal_endpoints() -> None:
+    """
+    The function hides the internal endpoints
+    unless `INTERNAL_ENDPOINTS` is enabled.
+    """
+    if not settings.INTERNAL_ENDPOINTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Not Found"
+        )
+
+
+@router.get("/pool", dependencies=[Depends(check_internal_endpoints)])
+async def get_pool_metrics() -> dict[str, dict[str, Any]]:
+    """
+    The function returns the statistics of the connection pools
+    of this worker for sizing the pools: of the primary database
+    and, if one is configured, of the read replica.
+    """
+    pools = {"primary": session_engine.pool.metrics()}
+
+    if replica_session_engine is not session_engine:
+        pools["replica"] = replica_session_engine.pool.metrics()
+
+    return pools
+
+
+@router.get(
+    "/password-hashing", dependencies=[Depends(check_internal_endpoints)]
+)
+async def get_password_hashing_metrics() -> dict[str, Any]:
+    """
+    The function returns the queue wait and hash time statistics
+    of the password hashing workers of this worker.
+    """
+    return password_hasher.metrics()
@@ -1,61 +1,293 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.config import settings
+from src.counters import bump_post_counter, update_post_counters
+from src.database import get_session
+from src.like_buffer import like_buffer
+from src.live import live_hub
 from src.models import Like, Post
 from src.oauth2 import get_current_user
-from src.schemas import LikeBase, LikeResponse
+from src.invalidation import commit_and_invalidate
+from src.post_cache import post_cache_keys
+from src.schemas import BatchItemResult, LikeBase, LikeBatch, LikeResponse
+from src.trending import bump_trending_score
 
 router = APIRouter(prefix="/likes", tags=["Like Endpoint"])
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
-def like_post(
-    like: LikeBase,
-    db: Session = Depends(get_db),
-    current_user: int = Depends(get_current_user),
-):
+async def raise_like_error(
+    db: AsyncSession, like: LikeBase, user_id: int
+) -> None:
     """
-    The function creates or deletes an existing `like`.
+    The function explains why a `like` could not be added or deleted.
     """
-    post = db.query(Post).filter(Post.post_id == like.post_id).first()
+    author_id = await db.scalar(
+        select(Post.user_id).filter(Post.post_id == like.post_id)
+    )
 
-    if not post:
+    if not author_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Post with post_id: {like.post_id} does not exist.",
         )
 
-    if post.user_id == current_user.user_id:
+    if author_id == user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You cannot like your own post.",
         )
 
-    like_query = db.query(Like).filter(
-        Like.post_id == like.post_id, Like.user_id == current_user.user_id
+    if like.liked:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"User with user_id: {user_id} "
+            f"has already liked on post with post_id: {like.post_id}.",
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Like does not exist.",
     )
-    found_like = like_query.first()
+
+
+async def buffer_like(
+    db: AsyncSession, like: LikeBase, user_id: int
+) -> ORJSONResponse:
+    """
+    The function checks a `like` against the database
+    and the pending intents of the user and leaves writing it
+    to the next flush of the `like_buffer`,
+    which is flushed first once it holds `LIKE_BUFFER_MAX_SIZE` intents.
+    """
+    if len(like_buffer) >= like_buffer.max_size:
+        await like_buffer.flush(db)
+
+    post = (
+        await db.execute(
+            select(
+                Post.user_id,
+                exists()
+                .where(Like.post_id == Post.post_id, Like.user_id == user_id)
+                .label("liked"),
+            ).filter(Post.post_id == like.post_id)
+        )
+    ).first()
+
+    if (
+        not post
+        or post.user_id == user_id
+        or like_buffer.liked(user_id, like.post_id, post.liked) == like.liked
+    ):
+        await raise_like_error(db, like, user_id)
+
+    like_buffer.add(user_id, like.post_id, like.liked)
 
     if like.liked:
-        if found_like:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"User with user_id: {current_user.user_id} "
-                f"has already liked on post with post_id: {like.post_id}.",
+        detail = "Successfully added like."
+    else:
+        detail = "Successfully deleted like."
+
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content={"detail": detail}
+    )
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def like_post(
+    like: LikeBase,
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+):
+    """
+    The function creates or deletes an existing `like`
+    and moves the counter and the trending score of the `post`
+    in the same statement.
+    With `LIKE_WRITE_BEHIND` the `like` is only buffered
+    and `202 Accepted` is returned.
+    """
+    if settings.LIKE_WRITE_BEHIND:
+        return await buffer_like(db, like, current_user.user_id)
+
+    if like.liked:
+        changed = (
+            insert(Like.__table__)
+            .from_select(
+                ["user_id", "post_id"],
+                select(literal(current_user.user_id), Post.post_id).filter(
+                    Post.post_id == like.post_id,
+                    Post.user_id != current_user.user_id,
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uq_user_post")
+            .returning(Like.post_id)
+            .cte("inserted_like")
+        )
+        delta = 1
+    else:
+        changed = (
+            delete(Like.__table__)
+            .filter(
+                Like.post_id == like.post_id,
+                Like.user_id == current_user.user_id,
             )
-        new_like = Like(user_id=current_user.user_id, post_id=like.post_id)
-        db.add(new_like)
-        db.commit()
+            .returning(Like.post_id)
+            .cte("deleted_like")
+        )
+        delta = -1
 
+    post_id = await db.scalar(
+        update_post_counters()
+        .filter(Post.post_id == changed.c.post_id)
+        .values(
+            {
+                Post.like_count: Post.like_count + delta,
+                **bump_trending_score(delta * settings.TRENDING_LIKE_WEIGHT),
+            }
+        )
+        .returning(Post.post_id)
+    )
+
+    if not post_id:
+        await raise_like_error(db, like, current_user.user_id)
+
+    await commit_and_invalidate(db, post_cache_keys(like.post_id))
+    live_hub.add_likes({like.post_id: delta})
+
+    if like.liked:
         return {"detail": "Successfully added like."}
-    else:
-        if not found_like:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Like does not exist.",
+
+    return {"detail": "Successfully deleted like."}
+
+
+@router.post("/batch", response_model=list[BatchItemResult])
+async def like_posts(
+    likes: LikeBatch,
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+) -> list[BatchItemResult]:
+    """
+    The function creates or deletes several `likes` with one statement
+    per operation in one transaction and returns the result of every item.
+    With `LIKE_WRITE_BEHIND` the `like_buffer` is flushed first
+    if it holds intents of the user for any of the `posts`,
+    so the batch is checked against them.
+    """
+    post_ids = {like.post_id for like in likes}
+
+    if settings.LIKE_WRITE_BEHIND and like_buffer.has_pending(
+        current_user.user_id, post_ids
+    ):
+        await like_buffer.flush(db)
+
+    post_authors = dict(
+        (
+            await db.execute(
+                select(Post.post_id, Post.user_id)
+                .filter(Post.post_id.in_(post_ids))
+                .with_for_update(key_share=True)
+            )
+        ).all()
+    )
+    seen = set()
+    duplicates = set()
+
+    for index, like in enumerate(likes):
+        if like.post_id in seen:
+            duplicates.add(index)
+        seen.add(like.post_id)
+
+    allowed = [
+        like
+        for index, like in enumerate(likes)
+        if index not in duplicates
+        and post_authors.get(like.post_id, current_user.user_id)
+        != current_user.user_id
+    ]
+    to_like = [like.post_id for like in allowed if like.liked]
+    to_unlike = [like.post_id for like in allowed if not like.liked]
+    liked = set()
+    unliked = set()
+
+    if to_like:
+        liked = set(
+            await db.scalars(
+                insert(Like)
+                .values(
+                    [
+                        {"user_id": current_user.user_id, "post_id": post_id}
+                        for post_id in to_like
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="uq_user_post")
+                .returning(Like.post_id)
+            )
+        )
+
+    if to_unlike:
+        unliked = set(
+            await db.scalars(
+                delete(Like)
+                .filter(
+                    Like.user_id == current_user.user_id,
+                    Like.post_id.in_(to_unlike),
+                )
+                .returning(Like.post_id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+
+    deltas = {
+        **{post_id: 1 for post_id in liked},
+        **{post_id: -1 for post_id in unliked},
+    }
+
+    if deltas:
+        await db.execute(
+            bump_post_counter(
+                Post.like_count,
+                deltas,
+                trending_weight=settings.TRENDING_LIKE_WEIGHT,
+            )
+        )
+
+    await commit_and_invalidate(db, post_cache_keys(*deltas))
+    live_hub.add_likes(deltas)
+
+    results = []
+
+    for index, like in enumerate(likes):
+        result = BatchItemResult(
+            index=index, status_code=status.HTTP_201_CREATED, id=like.post_id
+        )
+
+        if index in duplicates:
+            result.status_code = status.HTTP_409_CONFLICT
+            result.detail = f"Post with post_id: {like.post_id} is repeated."
+        elif like.post_id not in post_authors:
+            result.status_code = status.HTTP_404_NOT_FOUND
+            result.detail = (
+                f"Post with post_id: {like.post_id} does not exist."
+            )
+        elif post_authors[like.post_id] == current_user.user_id:
+            result.status_code = status.HTTP_403_FORBIDDEN
+            result.detail = "You cannot like your own post."
+        elif like.liked and like.post_id in liked:
+            result.detail = "Successfully added like."
+        elif like.liked:
+            result.status_code = status.HTTP_409_CONFLICT
+            result.detail = (
+                f"User with user_id: {current_user.user_id} "
+                f"has already liked on post with post_id: {like.post_id}."
             )
-        like_query.delete(synchronize_session=False)
-        db.commit()
+        elif like.post_id in unliked:
+            result.detail = "Successfully deleted like."
+        else:
+            result.status_code = status.HTTP_404_NOT_FOUND
+            result.detail = "Like does not exist."
+        results.append(result)
 
-        return {"detail": "Successfully deleted like."}
+    return results
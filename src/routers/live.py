@@ -0,0 +1,138 @@
+import asyncio
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    status,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import WebSocketException
+from starlette.requests import HTTPConnection
+
+from src.config import settings
+from src.database import get_session
+from src.live import live_hub, Subscriber
+from src.models import Post
+from src.oauth2 import get_current_user
+
+router = APIRouter(prefix="/posts", tags=["Live Endpoints"])
+
+
+async def get_live_post_id(
+    post_id: int,
+    connection: HTTPConnection,
+    token: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_session),
+) -> int:
+    """
+    The function authenticates a live connection by the `Authorization`
+    header or by the `token` query parameter, which browsers have to use
+    for WebSockets and `EventSource`, and checks that the `post` exists.
+    The session database is closed before the events are streamed.
+    """
+    scheme, _, credentials = connection.headers.get(
+        "Authorization", ""
+    ).partition(" ")
+
+    if scheme.lower() == "bearer" and credentials:
+        token = credentials
+
+    try:
+        await get_current_user(token=token or "", db=db)
+
+        if not await db.scalar(
+            select(Post.post_id).filter(Post.post_id == post_id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Post with post_id: {post_id} was not found.",
+            )
+    except HTTPException as error:
+        if isinstance(connection, WebSocket):
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION, reason=error.detail
+            )
+        raise
+    finally:
+        await db.close()
+
+    return post_id
+
+
+async def send_events(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """
+    The function sends the events of a `subscriber` to a WebSocket
+    until the subscriber is dropped.
+    """
+    while event := await subscriber.receive():
+        await websocket.send_text(event.text)
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """
+    The function ignores the messages of the client until it disconnects.
+    """
+    while True:
+        await websocket.receive_text()
+
+
+@router.websocket("/{post_id}/live")
+async def stream_post(
+    websocket: WebSocket, post_id: int = Depends(get_live_post_id)
+) -> None:
+    """
+    The function pushes the new `comments` and the like count changes
+    of a `post` to a WebSocket. A client that falls behind is disconnected
+    with the `1013 Try Again Later` code.
+    """
+    await websocket.accept()
+
+    with live_hub.subscribe(post_id) as subscriber:
+        sender = asyncio.create_task(send_events(websocket, subscriber))
+        receiver = asyncio.create_task(wait_for_disconnect(websocket))
+        await asyncio.wait(
+            {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+        )
+        sender.cancel()
+        receiver.cancel()
+        results = await asyncio.gather(
+            sender, receiver, return_exceptions=True
+        )
+
+    if subscriber.dropped and not isinstance(results[1], WebSocketDisconnect):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+@router.get("/{post_id}/live")
+async def stream_post_events(
+    post_id: int = Depends(get_live_post_id),
+) -> StreamingResponse:
+    """
+    The function streams the same events as server-sent events
+    for the clients that cannot use WebSockets, with a comment
+    every `LIVE_HEARTBEAT_SECONDS` seconds to keep the connection open.
+    """
+
+    async def events():
+        with live_hub.subscribe(post_id) as subscriber:
+            while not subscriber.dropped:
+                event = await subscriber.receive(
+                    timeout=settings.LIVE_HEARTBEAT_SECONDS
+                )
+
+                if event:
+                    yield event.sse
+                elif not subscriber.dropped:
+                    yield b": heartbeat\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,69 +1,427 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from datetime import datetime
 
-from src.database import get_db
-from src.models import Post, Like, Comment
+import orjson
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, insert, Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.config import settings
+from src.database import get_session
+from src.etags import (
+    comment_version,
+    ETAG_HEADER,
+    etag_matches,
+    make_etag,
+    not_modified,
+    POST_VERSION_COLUMNS,
+    post_version,
+)
+from src.feed import fan_out_posts
+from src.invalidation import commit_and_invalidate
+from src.like_buffer import like_buffer
+from src.models import Category, Comment, Post, User
 from src.oauth2 import get_current_user
+from src.pagination import NEXT_CURSOR_HEADER, encode_cursor, paginate
+from src.post_cache import (
+    fill_post_cache,
+    FIRST_PAGE_KEY,
+    pack_response,
+    post_cache_keys,
+    post_cache,
+    post_cache_generation,
+    post_key,
+    unpack_response,
+)
+from src.replica import get_read_db, get_read_target, ReadTarget
+from src.search import build_search_query
 from src.schemas import (
+    BatchDelete,
+    BatchItemResult,
+    CommentResponse,
+    PostBatchCreate,
     PostResponse,
     PostCreate,
     PostUpdate,
     PostLikeCommentResponse,
 )
+from src.serializers import (
+    serialize_comment,
+    serialize_post,
+    serialize_post_row,
+)
+from src.trending import trending_board
 
 router = APIRouter(prefix="/posts", tags=["Post Endpoints"])
 
 
+async def raise_post_write_error(db: AsyncSession, post_id: int) -> None:
+    """
+    The function explains why an ownership-checked write
+    did not match the `post`.
+    """
+    if not await db.scalar(
+        select(Post.post_id).filter(Post.post_id == post_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with post_id: {post_id} does not exist.",
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Not authorized to perform request action.",
+    )
+
+
+async def get_first_page(
+    db: AsyncSession, query: Select, read_target: ReadTarget
+) -> dict[str, list]:
+    """
+    The function returns the serialized first `POST_PAGE_CACHE_SIZE` `posts`
+    of the unfiltered list with their entity tags and cursors,
+    from the cache if the `read_target` allows it. Only the pages
+    read from the primary database are cached.
+    """
+    if read_target.reads_cache:
+        cached_page = await post_cache.get(FIRST_PAGE_KEY)
+
+        if cached_page:
+            return orjson.loads(cached_page)
+
+    generation = post_cache_generation.value
+    posts_query = paginate(
+        query=query,
+        position=Post.created_at,
+        key=Post.post_id,
+        after=None,
+        offset=0,
+        limit=settings.POST_PAGE_CACHE_SIZE,
+    )
+    posts = (await db.execute(posts_query)).all()
+    page = {
+        "posts": [serialize_post_row(post) for post in posts],
+        "etags": [make_etag(*post_version(post)) for post in posts],
+        "cursors": [
+            encode_cursor(post.Post.created_at, post.Post.post_id)
+            for post in posts
+        ],
+    }
+
+    if read_target.fills_cache:
+        await fill_post_cache(
+            FIRST_PAGE_KEY,
+            orjson.dumps(page),
+            ttl=settings.POST_PAGE_CACHE_TTL_SECONDS,
+            generation=generation,
+        )
+
+    return page
+
+
 @router.get("/", response_model=list[PostLikeCommentResponse])
-def get_posts(
-    db: Session = Depends(get_db),
-    offset: int = 0,
-    limit: int = 10,
+async def get_posts(
+    db: AsyncSession = Depends(get_read_db),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: str | None = None,
+    category: Category | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    author_id: int | None = None,
+    if_none_match: str | None = Header(default=None),
+    read_target: ReadTarget = Depends(get_read_target),
     current_user: int = Depends(get_current_user),
 ) -> list[PostResponse]:
     """
     The function returns a list of `posts` from the database,
     with optional pagination parameters to limit the number of `posts` returned.
+    The `posts` can be filtered by `category`, by `author_id`
+    and by the `since` (inclusive) and `until` (exclusive) creation dates.
+    The first page of the unfiltered list is served from the cache.
+    The cursor of the next page is returned in the `X-Next-Cursor` header.
+    The page has a weak `ETag`, and a matching `If-None-Match`
+    is answered with `304 Not Modified` without serializing the rows.
+    The rows are serialized directly, without re-validating them
+    against the response model.
+    """
+    query = select(
+        Post,
+        Post.like_count.label("likes"),
+        Post.comment_count.label("comments"),
+    ).options(joinedload(Post.author))
+    headers = {}
+
+    if (
+        after is None
+        and not offset
+        and limit <= settings.POST_PAGE_CACHE_SIZE
+        and not (category or author_id or since or until)
+    ):
+        page = await get_first_page(db, query, read_target)
+        posts = page["posts"][:limit]
+        etags = page["etags"][:limit]
+
+        if posts and len(posts) == limit:
+            headers[NEXT_CURSOR_HEADER] = page["cursors"][limit - 1]
+    else:
+        if category:
+            query = query.filter(Post.category == category)
+
+        if author_id:
+            query = query.filter(Post.user_id == author_id)
+
+        if since:
+            query = query.filter(Post.created_at >= since)
+
+        if until:
+            query = query.filter(Post.created_at < until)
+
+        posts_query = paginate(
+            query=query,
+            position=Post.created_at,
+            key=Post.post_id,
+            after=after,
+            offset=offset,
+            limit=limit,
+        )
+        rows = (await db.execute(posts_query)).all()
+        posts = None
+        etags = [make_etag(*post_version(post)) for post in rows]
+
+        if rows and len(rows) == limit:
+            last_post = rows[-1].Post
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                last_post.created_at, last_post.post_id
+            )
+
+    headers[ETAG_HEADER] = make_etag(*etags, weak=True)
+
+    if etag_matches(if_none_match, headers[ETAG_HEADER]):
+        return not_modified(headers[ETAG_HEADER], headers)
+
+    if posts is None:
+        posts = [serialize_post_row(post) for post in rows]
+
+    return ORJSONResponse(content=posts, headers=headers)
+
+
+@router.get("/search", response_model=list[PostLikeCommentResponse])
+async def search_posts(
+    q: str = Query(min_length=1, max_length=256),
+    category: Category | None = None,
+    db: AsyncSession = Depends(get_session),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: str | None = None,
+    current_user: int = Depends(get_current_user),
+) -> list[PostLikeCommentResponse]:
+    """
+    The function returns the `posts` whose `title` or `content`
+    match the search terms `q`, from the best to the worst match,
+    optionally limited to a single `category`.
+    The cursor of the next page is returned in the `X-Next-Cursor` header.
     """
     posts = (
-        db.query(
-            Post,
-            func.count(Like.post_id).label("likes"),
-            func.count(Comment.post_id).label("comments"),
-        )
-        .outerjoin(Like, Like.post_id == Post.post_id)
-        .outerjoin(Comment, Comment.post_id == Post.post_id)
-        .group_by(Post.post_id)
-        .limit(limit)
-        .offset(offset)
-        .all()
+        await db.execute(
+            build_search_query(q, category, after=after, limit=limit)
+        )
+    ).all()
+    headers = {}
+
+    if posts and len(posts) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            posts[-1].rank, posts[-1].Post.post_id
+        )
+
+    return ORJSONResponse(
+        content=[serialize_post_row(post) for post in posts], headers=headers
     )
 
-    return posts
+
+@router.get("/trending", response_model=list[PostLikeCommentResponse])
+async def get_trending_posts(
+    db: AsyncSession = Depends(get_session),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user: int = Depends(get_current_user),
+) -> list[PostLikeCommentResponse]:
+    """
+    The function returns the `posts` with the highest engagement score,
+    in which likes and comments count less the older they are.
+    The `posts` are served from memory and reloaded in the background,
+    so their counters may lag behind by `TRENDING_REFRESH_SECONDS`.
+    """
+    if trending_board.refreshed_at is None:
+        await trending_board.refresh(db)
+
+    return ORJSONResponse(content=trending_board.posts[:limit])
+
+
+@router.post("/batch", response_model=list[BatchItemResult])
+async def create_posts(
+    posts: PostBatchCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+) -> list[BatchItemResult]:
+    """
+    The function creates several `posts` with a single statement
+    in one transaction, fans them out to the timelines
+    of the author's followers and returns the result of every item.
+    """
+    post_ids = (
+        await db.scalars(
+            insert(Post)
+            .values(
+                [
+                    {"user_id": current_user.user_id, **post.dict()}
+                    for post in posts
+                ]
+            )
+            .returning(Post.post_id)
+        )
+    ).all()
+    await db.execute(fan_out_posts(post_ids))
+    await commit_and_invalidate(db, post_cache_keys())
+
+    return [
+        BatchItemResult(
+            index=index, status_code=status.HTTP_201_CREATED, id=post_id
+        )
+        for index, post_id in enumerate(post_ids)
+    ]
+
+
+@router.delete("/batch", response_model=list[BatchItemResult])
+async def delete_posts(
+    post_ids: BatchDelete = Body(),
+    db: AsyncSession = Depends(get_session),
+    current_user: int = Depends(get_current_user),
+) -> list[BatchItemResult]:
+    """
+    The function deletes several `posts` of the current user
+    with a single statement and returns the result of every item.
+    """
+    deleted = set(
+        await db.scalars(
+            delete(Post)
+            .filter(
+                Post.post_id.in_(post_ids),
+                Post.user_id == current_user.user_id,
+            )
+            .returning(Post.post_id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    not_deleted = set(post_ids) - deleted
+    foreign = set()
+
+    if not_deleted:
+        foreign = set(
+            await db.scalars(
+                select(Post.post_id).filter(Post.post_id.in_(not_deleted))
+            )
+        )
+
+    await commit_and_invalidate(db, post_cache_keys(*deleted))
+
+    results = []
+
+    for index, post_id in enumerate(post_ids):
+        if post_id in deleted:
+            result = BatchItemResult(
+                index=index, status_code=status.HTTP_204_NO_CONTENT, id=post_id
+            )
+        elif post_id in foreign:
+            result = BatchItemResult(
+                index=index,
+                status_code=status.HTTP_403_FORBIDDEN,
+                id=post_id,
+                detail="Not authorized to perform request action.",
+            )
+        else:
+            result = BatchItemResult(
+                index=index,
+                status_code=status.HTTP_404_NOT_FOUND,
+                id=post_id,
+                detail=f"Post with post_id: {post_id} does not exist.",
+            )
+        results.append(result)
+
+    return results
 
 
 @router.get("/{post_id}", response_model=PostLikeCommentResponse)
-def get_post(
+async def get_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: str | None = Header(default=None),
+    read_target: ReadTarget = Depends(get_read_target),
     current_user: int = Depends(get_current_user),
 ) -> PostResponse:
     """
-    The function returns a single `post` from the database.
+    The function returns a single `post` from the cache or the database
+    with a strong `ETag` derived from its `updated_at` and counters.
+    A matching `If-None-Match` is answered with `304 Not Modified`
+    from the cache or after looking up only these columns.
+    The buffered likes of the user are added to the counter,
+    and such a response is neither cached nor validated.
+    The cache is skipped by the users who have just written
+    and filled only from the primary database.
     """
-    post = (
-        db.query(
+    own_likes = like_buffer.pending_delta(current_user.user_id, post_id)
+    cached_post = None
+
+    if not own_likes and read_target.reads_cache:
+        cached_post = await post_cache.get(post_key(post_id))
+
+    if cached_post:
+        etag, body = unpack_response(cached_post)
+
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        return Response(
+            content=body,
+            media_type=ORJSONResponse.media_type,
+            headers={ETAG_HEADER: etag},
+        )
+
+    generation = post_cache_generation.value
+
+    if if_none_match and not own_likes:
+        version = (
+            await db.execute(
+                select(*POST_VERSION_COLUMNS)
+                .join(User, User.user_id == Post.user_id)
+                .filter(Post.post_id == post_id)
+            )
+        ).first()
+
+        if version:
+            etag = make_etag(*version)
+
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    post_query = (
+        select(
             Post,
-            func.count(Like.post_id).label("likes"),
-            func.count(Comment.post_id).label("comments"),
+            Post.like_count.label("likes"),
+            Post.comment_count.label("comments"),
         )
-        .outerjoin(Like, Like.post_id == Post.post_id)
-        .outerjoin(Comment, Comment.post_id == Post.post_id)
-        .group_by(Post.post_id)
+        .options(joinedload(Post.author))
         .filter(Post.post_id == post_id)
-        .first()
     )
+    post = (await db.execute(post_query)).first()
 
     if not post:
         raise HTTPException(
@@ -71,7 +429,82 @@ def get_post(
             detail=f"Post with post_id: {post_id} was not found.",
         )
 
-    return post
+    if own_likes:
+        return {**serialize_post_row(post), "likes": post.likes + own_likes}
+
+    etag = make_etag(*post_version(post))
+    body = orjson.dumps(serialize_post_row(post))
+
+    if read_target.fills_cache:
+        await fill_post_cache(
+            post_key(post_id),
+            pack_response(etag, body),
+            ttl=settings.POST_CACHE_TTL_SECONDS,
+            generation=generation,
+        )
+
+    return Response(
+        content=body,
+        media_type=ORJSONResponse.media_type,
+        headers={ETAG_HEADER: etag},
+    )
+
+
+@router.get("/{post_id}/comments", response_model=list[CommentResponse])
+async def get_post_comments(
+    post_id: int,
+    db: AsyncSession = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    current_user: int = Depends(get_current_user),
+) -> list[CommentResponse]:
+    """
+    The function returns the `comments` of a single `post`
+    from the oldest to the newest one.
+    The cursor of the next page is returned in the `X-Next-Cursor` header.
+    The page has a weak `ETag`, and a matching `If-None-Match`
+    is answered with `304 Not Modified` without serializing the rows.
+    """
+    comments_query = paginate(
+        query=select(Comment)
+        .options(joinedload(Comment.author))
+        .filter(Comment.post_id == post_id),
+        position=Comment.created_at,
+        key=Comment.comment_id,
+        after=after,
+        offset=offset,
+        limit=limit,
+        newest_first=False,
+    )
+    comments = (await db.scalars(comments_query)).all()
+    headers = {}
+
+    if not comments and not await db.scalar(
+        select(Post.post_id).filter(Post.post_id == post_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with post_id: {post_id} was not found.",
+        )
+
+    if comments and len(comments) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            comments[-1].created_at, comments[-1].comment_id
+        )
+
+    headers[ETAG_HEADER] = make_etag(
+        *[comment_version(comment) for comment in comments], weak=True
+    )
+
+    if etag_matches(if_none_match, headers[ETAG_HEADER]):
+        return not_modified(headers[ETAG_HEADER], headers)
+
+    return ORJSONResponse(
+        content=[serialize_comment(comment) for comment in comments],
+        headers=headers,
+    )
 
 
 @router.post(
@@ -79,76 +512,75 @@ def get_post(
     response_model=PostResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_post(
+async def create_post(
     post: PostCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> PostResponse:
     """
-    The function creates a new `post` in the database.
+    The function creates a new `post` in the database
+    and fans it out to the timelines of the author's followers.
     """
     new_post = Post(user_id=current_user.user_id, **post.dict())
     db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    await db.flush()
+    await db.execute(fan_out_posts([new_post.post_id]))
+    await commit_and_invalidate(db, post_cache_keys())
 
-    return new_post
+    return await db.scalar(
+        select(Post)
+        .options(joinedload(Post.author))
+        .filter(Post.post_id == new_post.post_id)
+        .execution_options(populate_existing=True)
+    )
 
 
 @router.put("/{post_id}", response_model=PostResponse)
-def update_post(
+async def update_post(
     post_id: int,
     post: PostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> PostResponse:
     """
     The function updates an existing `post` in the database.
     """
-    post_query = db.query(Post).filter(Post.post_id == post_id)
-    updated_post = post_query.first()
-
-    if not updated_post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Post with post_id: {post_id} does not exist.",
+    updated_post = (
+        await db.execute(
+            update(Post.__table__)
+            .filter(
+                Post.post_id == post_id, Post.user_id == current_user.user_id
+            )
+            .values(**post.dict())
+            .returning(*Post.__table__.c)
         )
+    ).first()
 
-    if updated_post.user_id != current_user.user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to perform request action.",
-        )
+    if not updated_post:
+        await raise_post_write_error(db, post_id)
 
-    post_query.update(post.dict(), synchronize_session=False)
-    db.commit()
+    await commit_and_invalidate(db, post_cache_keys(post_id))
 
-    return post_query.first()
+    return serialize_post(updated_post, author=current_user)
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user: int = Depends(get_current_user),
 ) -> None:
     """
     The function deletes an existing `post` in the database.
     """
-    post_query = db.query(Post).filter(Post.post_id == post_id)
-    post = post_query.first()
-
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Post with post_id: {post_id} does not exist.",
-        )
+    deleted_post_id = await db.scalar(
+        delete(Post)
+        .filter(Post.post_id == post_id, Post.user_id == current_user.user_id)
+        .returning(Post.post_id)
+        .execution_options(synchronize_session=False)
+    )
 
-    if post.user_id != current_user.user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to perform request action.",
-        )
+    if not deleted_post_id:
+        await raise_post_write_error(db, post_id)
 
-    post_query.delete(synchronize_session=False)
-    db.commit()
+    await commit_and_invalidate(db, post_cache_keys(post_id))
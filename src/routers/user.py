@@ -1,23 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Column, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
-from src.models import User
-from src.schemas import UserResponse, UserCreate
-from src.utils import get_hashed_password
+from src.config import settings
+from src.database import get_session
+from src.models import Follow, User
+from src.rate_limit import limit_password_attempts
+from src.replica import get_read_db
+from src.schemas import UserResponse, UserCreate, UserSummaryResponse
+from src.utils import password_hasher
 
 router = APIRouter(prefix="/users", tags=["User Endpoints"])
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> UserResponse:
     """
     The function returns a single `user` from the database.
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.scalar(select(User).filter(User.user_id == user_id))
     print(user)
 
     if not user:
@@ -29,23 +33,91 @@ def get_user(
     return user
 
 
+async def get_related_users(
+    db: AsyncSession,
+    user_id: int,
+    related: Column,
+    owner: Column,
+    offset: int,
+    limit: int,
+) -> list[User]:
+    """
+    The function returns the `users` on the `related` side of the `follows`
+    of a single `user`, from the most recent `follow`.
+    """
+    users = (
+        await db.scalars(
+            select(User)
+            .join(Follow, related == User.user_id)
+            .filter(owner == user_id)
+            .order_by(Follow.created_at.desc(), Follow.follow_id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+    ).all()
+
+    if not users and not await db.scalar(
+        select(User.user_id).filter(User.user_id == user_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with user_id: {user_id} does not exist.",
+        )
+
+    return users
+
+
+@router.get("/{user_id}/followers", response_model=list[UserSummaryResponse])
+async def get_followers(
+    user_id: int,
+    db: AsyncSession = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+) -> list[UserSummaryResponse]:
+    """
+    The function returns the `users` who follow a single `user`.
+    """
+    return await get_related_users(
+        db, user_id, Follow.follower_id, Follow.followee_id, offset, limit
+    )
+
+
+@router.get("/{user_id}/following", response_model=list[UserSummaryResponse])
+async def get_following(
+    user_id: int,
+    db: AsyncSession = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+) -> list[UserSummaryResponse]:
+    """
+    The function returns the `users` a single `user` follows.
+    """
+    return await get_related_users(
+        db, user_id, Follow.followee_id, Follow.follower_id, offset, limit
+    )
+
+
 @router.post(
     "/",
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_user(
-    user: UserCreate, db: Session = Depends(get_db)
+async def create_user(
+    request: Request,
+    user: UserCreate,
+    db: AsyncSession = Depends(get_session),
 ) -> UserResponse:
     """
     The function creates a new `user` in the database.
     """
-    hashed_password = get_hashed_password(user.password)
+    await limit_password_attempts(request, user.email)
+
+    hashed_password = await password_hasher.hash(user.password)
     user.password = hashed_password
 
     new_user = User(**user.dict())
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
@@ -2,7 +2,7 @@ import re
 from datetime import datetime
 from string import punctuation
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, conlist, EmailStr, validator
 
 from src.exceptions import (
     ContentFormatException,
@@ -21,6 +21,7 @@ PHONE_NUMBER_REGEX = re.compile(
     r"^(?:\+38|0)?\(?0?\d{2}\)?\s?\d{3}-?\d{2}-?\d{2}$"
 )
 PUNCTUATION_WITHOUT_UNDERSCORE = punctuation.replace("_", "")
+BATCH_MAX_SIZE = 1000
 
 
 def validate_content(content: str) -> str:
@@ -237,6 +238,7 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     user_id: int
     is_active: bool
+    follower_count: int
     is_superuser: bool
     is_verified: bool
     created_at: datetime
@@ -255,6 +257,16 @@ class UserSummaryResponse(BaseModel):
         orm_mode = True
 
 
+class CurrentUser(BaseModel):
+    user_id: int
+    username: str
+    email: EmailStr
+    is_active: bool
+
+    class Config:
+        orm_mode = True
+
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -267,6 +279,9 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     user_id: int | None = None
+    username: str | None = None
+    email: EmailStr | None = None
+    is_active: bool | None = None
 
 
 class CommentBase(BaseModel):
@@ -286,6 +301,11 @@ class CommentUpdate(CommentBase):
     pass
 
 
+CommentBatchCreate = conlist(
+    CommentCreate, min_items=1, max_items=BATCH_MAX_SIZE
+)
+
+
 class CommentResponse(CommentBase):
     comment_id: int
     created_at: datetime
@@ -301,6 +321,14 @@ class LikeBase(BaseModel):
     liked: bool
 
 
+LikeBatch = conlist(LikeBase, min_items=1, max_items=BATCH_MAX_SIZE)
+
+
+class FollowBase(BaseModel):
+    followee_id: int
+    followed: bool
+
+
 class LikeResponse(LikeBase):
     like_id: int
     created_at: datetime
@@ -341,6 +369,9 @@ class PostCreate(PostBase):
     pass
 
 
+PostBatchCreate = conlist(PostCreate, min_items=1, max_items=BATCH_MAX_SIZE)
+
+
 class PostUpdate(PostBase):
     pass
 
@@ -362,3 +393,13 @@ class PostLikeCommentResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+BatchDelete = conlist(int, min_items=1, max_items=BATCH_MAX_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status_code: int
+    id: int | None = None
+    detail: str | None = None
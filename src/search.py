@@ -0,0 +1,49 @@
+from sqlalchemy import cast, Double, func, select, Select
+from sqlalchemy.orm import joinedload
+
+from src.models import Category, Post, SEARCH_CONFIG
+from src.pagination import paginate
+
+
+def build_search_query(
+    q: str, category: Category | None, after: str | None, limit: int
+) -> Select:
+    """
+    The function builds the query of a single page of `posts`
+    matching the search terms `q`, from the best to the worst match.
+    The `tsquery` is parsed with `websearch_to_tsquery`,
+    so quoted phrases, `or` and `-` exclusions are supported.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # `ts_rank` returns a `real`, which does not survive the round trip
+    # through a JSON cursor; a `double precision` does.
+    rank = cast(func.ts_rank(Post.search_vector, tsquery), Double)
+    matches = select(Post.post_id, rank.label("rank")).filter(
+        Post.search_vector.bool_op("@@")(tsquery)
+    )
+
+    if category:
+        matches = matches.filter(Post.category == category)
+
+    # The page is ranked and cut before the authors are joined,
+    # so only `limit` rows are joined to the `user` table.
+    page = paginate(
+        query=matches,
+        position=rank,
+        key=Post.post_id,
+        after=after,
+        offset=0,
+        limit=limit,
+    ).subquery()
+
+    return (
+        select(
+            Post,
+            Post.like_count.label("likes"),
+            Post.comment_count.label("comments"),
+            page.c.rank,
+        )
+        .join(page, page.c.post_id == Post.post_id)
+        .options(joinedload(Post.author))
+        .order_by(page.c.rank.desc(), Post.post_id.desc())
+    )
@@ -0,0 +1,64 @@
+from typing import Any
+
+from sqlalchemy import Row
+
+from src.models import Comment, Post, User
+from src.schemas import CurrentUser
+
+
+def serialize_user_summary(user: User | CurrentUser) -> dict[str, Any]:
+    """
+    The function converts a `user` to the `UserSummaryResponse` shape.
+    """
+    return {
+        "user_id": user.user_id,
+        "username": user.username,
+        "email": user.email,
+    }
+
+
+def serialize_post(
+    post: Post | Row, author: User | CurrentUser | None = None
+) -> dict[str, Any]:
+    """
+    The function converts a `post` to the `PostResponse` shape.
+    The `author` is taken from the `post` unless it is already known.
+    """
+    return {
+        "title": post.title,
+        "content": post.content,
+        "category": post.category,
+        "post_id": post.post_id,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+        "author": serialize_user_summary(author or post.author),
+    }
+
+
+def serialize_post_row(row: Row) -> dict[str, Any]:
+    """
+    The function converts a `(Post, likes, comments)` row
+    to the `PostLikeCommentResponse` shape.
+    """
+    return {
+        "Post": serialize_post(row.Post),
+        "likes": row.likes,
+        "comments": row.comments,
+    }
+
+
+def serialize_comment(
+    comment: Comment | Row, author: User | CurrentUser | None = None
+) -> dict[str, Any]:
+    """
+    The function converts a `comment` to the `CommentResponse` shape.
+    The `author` is taken from the `comment` unless it is already known.
+    """
+    return {
+        "content": comment.content,
+        "post_id": comment.post_id,
+        "comment_id": comment.comment_id,
+        "created_at": comment.created_at,
+        "updated_at": comment.updated_at,
+        "author": serialize_user_summary(author or comment.author),
+    }
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import timedelta
+from typing import Any, Callable
+
+from sqlalchemy import case, cast, ColumnElement, Float, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Update
+
+from src.config import settings
+from src.database import session_scope
+from src.models import Post
+from src.serializers import serialize_post_row
+
+
+logger = logging.getLogger(__name__)
+
+DECAY_RATE = math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def decayed_score() -> ColumnElement:
+    """
+    The function returns the `trending_score` of a `post`
+    decayed from its `trending_decayed_at` to the current time.
+    """
+    elapsed = cast(
+        func.extract("epoch", func.now() - Post.trending_decayed_at), Float
+    )
+
+    return Post.trending_score * func.exp(-DECAY_RATE * elapsed)
+
+
+def bump_trending_score(weight: Any) -> dict[ColumnElement, ColumnElement]:
+    """
+    The function returns the values that decay the `trending_score`
+    of a `post` to the current time and add the `weight`
+    of a new (or, if negative, a removed) like or comment.
+    """
+    return {
+        Post.trending_score: func.greatest(decayed_score() + weight, 0),
+        Post.trending_decayed_at: func.now(),
+    }
+
+
+def decay_trending_scores() -> Update:
+    """
+    The function builds a statement that decays the `trending_score`
+    of every `post` not decayed during the last half of the decay interval.
+    Negligible scores are reset to zero, so the `posts`
+    drop out of the next runs. The `updated_at` of the `posts` is kept.
+    """
+    score = decayed_score()
+
+    return (
+        update(Post)
+        .filter(
+            Post.trending_score > 0,
+            Post.trending_decayed_at
+            < func.now()
+            - timedelta(seconds=settings.TRENDING_DECAY_SECONDS / 2),
+        )
+        .values(
+            {
+                Post.trending_score: case(
+                    (score < settings.TRENDING_MIN_SCORE, 0), else_=score
+                ),
+                Post.trending_decayed_at: func.now(),
+                Post.updated_at: Post.updated_at,
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+class TrendingBoard:
+    """
+    The class holds the serialized `posts` with the highest `trending_score`
+    in memory, so reading them does not touch the database.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        refresh_interval: float,
+        decay_interval: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.decay_interval = decay_interval
+        self.timer = timer
+        self.posts: list[dict[str, Any]] = []
+        self.refreshed_at: float | None = None
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        The method reloads the top `size` `posts` from the database.
+        """
+        posts = (
+            await db.execute(
+                select(
+                    Post,
+                    Post.like_count.label("likes"),
+                    Post.comment_count.label("comments"),
+                )
+                .options(joinedload(Post.author))
+                .filter(Post.trending_score > 0)
+                .order_by(Post.trending_score.desc(), Post.post_id.desc())
+                .limit(self.size)
+            )
+        ).all()
+        self.posts = [serialize_post_row(post) for post in posts]
+        self.refreshed_at = self.timer()
+
+    async def decay(self, db: AsyncSession) -> None:
+        """
+        The method decays the stored scores to the current time.
+        """
+        await db.execute(decay_trending_scores())
+        await db.commit()
+
+    async def run(self) -> None:
+        """
+        The method refreshes the `posts` every `refresh_interval` seconds
+        and decays the scores every `decay_interval` seconds
+        until it is cancelled.
+        """
+        decayed_at = None
+
+        while True:
+            try:
+                async with session_scope() as db:
+                    if (
+                        decayed_at is None
+                        or self.timer() - decayed_at >= self.decay_interval
+                    ):
+                        await self.decay(db)
+                        decayed_at = self.timer()
+
+                    await self.refresh(db)
+            except Exception:
+                logger.exception("Failed to refresh the trending posts.")
+
+            await asyncio.sleep(self.refresh_interval)
+
+    def clear(self) -> None:
+        """
+        The method forgets the loaded `posts`.
+        """
+        self.posts = []
+        self.refreshed_at = None
+
+
+trending_board = TrendingBoard(
+    size=settings.TRENDING_SIZE,
+    refresh_interval=settings.TRENDING_REFRESH_SECONDS,
+    decay_interval=settings.TRENDING_DECAY_SECONDS,
+)
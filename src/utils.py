@@ -1,5 +1,16 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
+from src.config import settings
+from src.exceptions import PasswordHashingOverloadException
+
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,3 +29,142 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     an existing `password` in the database.
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def _timed_call(fn: Callable, *args: Any) -> tuple[Any, float, float]:
+    """
+    The function runs `fn` inside a worker process
+    and returns its result with the wall-clock start and end times.
+    """
+    started_at = time.time()
+    result = fn(*args)
+
+    return result, started_at, time.time()
+
+
+class PasswordHasher:
+    """
+    The class runs password hashing in a dedicated bounded process pool,
+    so bcrypt does not occupy the threadpool that serves other endpoints.
+    A pool broken by a dead worker process is replaced with a new one.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.calls = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._executor
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHashingOverloadException(
+                    detail="Too many password operations, try again later.",
+                    retry_after=1,
+                )
+            self.pending += 1
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        submitted_at = time.time()
+        try:
+            result, started_at, finished_at = await loop.run_in_executor(
+                executor, _timed_call, fn, *args
+            )
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise PasswordHashingOverloadException(
+                detail="Password workers are restarting, try again later.",
+                retry_after=1,
+            )
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+        self._record(started_at - submitted_at, finished_at - started_at)
+
+        return result
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+
+            self._executor = None
+            self.restarts += 1
+
+        executor.shutdown(wait=False)
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    async def hash(self, password: str) -> str:
+        """
+        The method returns a `hashed` version of the `password`.
+        """
+        return await self._run(get_hashed_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        The method checks whether the `plain_password`
+        matches the `hashed_password`.
+        """
+        return await self._run(
+            verify_password, plain_password, hashed_password
+        )
+
+    def metrics(self) -> dict[str, float]:
+        """
+        The method returns the queue wait and hash time statistics in seconds.
+        """
+        with self._lock:
+            calls = self.calls or 1
+
+            return {
+                "pending": self.pending,
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "restarts": self.restarts,
+                "queue_wait_avg": self.queue_wait_total / calls,
+                "queue_wait_max": self.queue_wait_max,
+                "hash_time_avg": self.hash_time_total / calls,
+                "hash_time_max": self.hash_time_max,
+            }
+
+    def shutdown(self) -> None:
+        """
+        The method stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_queue=settings.PASSWORD_HASHING_MAX_QUEUE,
+)
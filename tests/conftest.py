@@ -1,16 +1,31 @@
-from typing import Type
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Type
 
 from fastapi import status
 from fastapi.testclient import TestClient
 from pytest import fixture
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 
 from src.config import settings
-from src.database import get_db
+from src.database import (
+    get_async_db,
+    get_async_replica_db,
+    get_db,
+    get_replica_db,
+)
+from src.like_buffer import like_buffer
+from src.live import live_hub
 from src.main import app
 from src.models import Base, Comment, Post
-from src.oauth2 import create_access_token
+from src.oauth2 import create_access_token, user_cache
+from src.post_cache import post_cache
+from src.rate_limit import rate_limit_backend
+from src.reconcile import reconcile_post_counters
+from src.replica import recent_writers
+from src.trending import trending_board
 
 
 SQLALCHEMY_DATABASE_URL = (
@@ -22,12 +37,28 @@ SQLALCHEMY_DATABASE_URL = (
     f"{settings.POSTGRES_DB}_test"
 )
 
+ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 TestingSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Every `TestClient` request runs in its own event loop,
+# so the async connections must not outlive a single request.
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool
 )
 
+TestingAsyncSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=async_engine
+)
+
+app_engine = async_engine.sync_engine if settings.DATABASE_ASYNC else engine
+
 
 @fixture
 def session() -> Session:
@@ -45,6 +76,31 @@ def session() -> Session:
         db.close()
 
 
+@fixture
+def assert_num_queries() -> Callable[[int], ContextManager[list[str]]]:
+    """
+    The function returns a context manager that fails the test
+    if the code inside it issues a different number of SQL statements.
+    """
+
+    @contextmanager
+    def _assert_num_queries(expected: int) -> list[str]:
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(app_engine, "before_cursor_execute", count_statement)
+        try:
+            yield statements
+        finally:
+            event.remove(app_engine, "before_cursor_execute", count_statement)
+
+        assert len(statements) == expected, "\n\n".join(statements)
+
+    return _assert_num_queries
+
+
 @fixture
 def client(session: Session) -> TestClient:
     """
@@ -57,7 +113,21 @@ def client(session: Session) -> TestClient:
         finally:
             session.close()
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    user_cache.clear()
+    post_cache.clear()
+    rate_limit_backend.clear()
+    trending_board.clear()
+    like_buffer.clear()
+    live_hub.clear()
+    recent_writers.clear()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_replica_db] = override_get_db
+    app.dependency_overrides[get_async_replica_db] = override_get_async_db
 
     yield TestClient(app=app)
 
@@ -195,5 +265,6 @@ def test_comments(
 
     session.add_all(comments)
     session.commit()
+    reconcile_post_counters(session)
 
     return session.query(Comment).all()
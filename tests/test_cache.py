@@ -0,0 +1,279 @@
+import asyncio
+import socket
+import threading
+import time
+from typing import Callable, ContextManager, Iterator, Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import fixture
+from sqlalchemy.orm import Session
+
+from src.cache import InMemoryCacheBackend, RedisCacheBackend, TTLCache
+from src.invalidation import evict
+from src.models import Post, User
+from src.oauth2 import user_cache
+from src.post_cache import (
+    fill_post_cache,
+    post_cache,
+    post_cache_generation,
+    post_key,
+)
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "jessica")
+    cache.set(2, "jones")
+    cache.get(1)
+    cache.set(3, "james")
+
+    assert cache.get(1) == "jessica"
+    assert cache.get(2) is None
+    assert cache.get(3) == "james"
+    assert len(cache) == 2
+
+
+def test_cache_expires_entries() -> None:
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=60, timer=timer)
+    cache.set(1, "jessica")
+
+    timer.now = 59
+    assert cache.get(1) == "jessica"
+
+    timer.now = 60
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_limits_ttl() -> None:
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=60, timer=timer)
+    cache.max_ttl = 5
+    cache.set(1, "jessica")
+
+    timer.now = 5
+    assert cache.get(1) is None
+
+
+def test_current_user_is_cached(
+    authorized_client: TestClient,
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    authorized_client.get("/comments/")
+
+    with assert_num_queries(1):
+        response = authorized_client.get("/comments/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (user_cache.hits, user_cache.misses) == (1, 1)
+
+
+def test_deactivated_user_is_invalidated(
+    authorized_client: TestClient, session: Session, test_user: dict
+) -> None:
+    authorized_client.get("/comments/")
+
+    user = session.get(User, test_user["user_id"])
+    user.is_active = False
+    session.commit()
+
+    response = authorized_client.get("/comments/")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@fixture
+def redis_url() -> Iterator[str]:
+    """
+    The function runs a minimal local stand-in of a Redis server
+    that supports `GET`, `SET` with `PX` and `DEL`, and returns its URL.
+    """
+    entries = {}
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                name, *args = await RedisCacheBackend._read_reply(reader)
+
+                if name == b"GET":
+                    value, expires_at = entries.get(args[0], (None, 0))
+                    if value is None or expires_at <= time.monotonic():
+                        writer.write(b"$-1\r\n")
+                    else:
+                        writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                elif name == b"SET":
+                    entries[args[0]] = (
+                        args[1],
+                        time.monotonic() + int(args[3]) / 1000,
+                    )
+                    writer.write(b"+OK\r\n")
+                elif name == b"DEL":
+                    deleted = [entries.pop(key, None) for key in args]
+                    writer.write(b":%d\r\n" % sum(map(bool, deleted)))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(handle, "127.0.0.1", 0)
+    )
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}/0"
+
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def test_in_memory_backend_expires_entries_per_key() -> None:
+    timer = FakeTimer()
+    backend = InMemoryCacheBackend(maxsize=2, timer=timer)
+    asyncio.run(backend.set("short", b"1", ttl=1))
+    asyncio.run(backend.set("long", b"2", ttl=10))
+
+    timer.now = 5
+    assert asyncio.run(backend.get("short")) is None
+    assert asyncio.run(backend.get("long")) == b"2"
+
+
+def test_redis_backend(redis_url: str) -> None:
+    backend = RedisCacheBackend(redis_url)
+    asyncio.run(backend.set("post:1", b"\r\n{}", ttl=60))
+    asyncio.run(backend.set("post:2", b"{}", ttl=0.001))
+    time.sleep(0.01)
+
+    assert asyncio.run(backend.get("post:1")) == b"\r\n{}"
+    assert asyncio.run(backend.get("post:2")) is None
+
+    asyncio.run(backend.delete("post:1", "post:2"))
+
+    assert asyncio.run(backend.get("post:1")) is None
+    assert backend.errors == 0
+
+
+def test_redis_backend_unavailable() -> None:
+    backend = RedisCacheBackend("redis://127.0.0.1:1/0")
+    asyncio.run(backend.set("post:1", b"{}", ttl=60))
+
+    assert asyncio.run(backend.get("post:1")) is None
+    assert backend.errors == 2
+
+
+def test_redis_backend_timeout() -> None:
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        backend = RedisCacheBackend(
+            f"redis://127.0.0.1:{server.getsockname()[1]}/0", timeout=0.1
+        )
+
+        assert asyncio.run(backend.get("post:1")) is None
+        assert backend.errors == 1
+
+
+def test_post_is_cached(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    url = f"/posts/{test_posts[2].post_id}"
+    authorized_client.get(url)
+
+    with assert_num_queries(0):
+        response = authorized_client.get(url)
+
+    assert response.json()["likes"] == 0
+
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+    authorized_client.post(
+        "/comments/",
+        json={"content": "Great post!", "post_id": test_posts[2].post_id},
+    )
+    response = authorized_client.get(url)
+
+    assert (response.json()["likes"], response.json()["comments"]) == (1, 1)
+
+
+def test_first_page_is_cached(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    authorized_client.get("/posts/")
+
+    with assert_num_queries(0):
+        first_page = authorized_client.get("/posts/", params={"limit": 2})
+
+    second_page = authorized_client.get(
+        "/posts/", params={"after": first_page.headers["X-Next-Cursor"]}
+    )
+    post_ids = [
+        post["Post"]["post_id"]
+        for post in first_page.json() + second_page.json()
+    ]
+
+    assert post_ids == sorted(
+        (post.post_id for post in test_posts), reverse=True
+    )
+
+    authorized_client.put(
+        f"/posts/{test_posts[0].post_id}",
+        json={
+            "title": "Updated title",
+            "content": "Updated content.",
+            "category": "ENVIRONMENT",
+        },
+    )
+    response = authorized_client.get("/posts/")
+
+    assert response.json()[-1]["Post"]["title"] == "Updated title"
+
+
+def test_post_cache_fill_after_invalidation() -> None:
+    generation = post_cache_generation.value
+    evict([post_key(1)])
+    asyncio.run(
+        fill_post_cache(post_key(1), b"stale", ttl=60, generation=generation)
+    )
+
+    assert asyncio.run(post_cache.get(post_key(1))) is None
+
+    asyncio.run(
+        fill_post_cache(
+            post_key(1),
+            b"fresh",
+            ttl=60,
+            generation=post_cache_generation.value,
+        )
+    )
+
+    assert asyncio.run(post_cache.get(post_key(1))) == b"fresh"
+
+
+def test_deleted_post_is_invalidated(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    url = f"/posts/{test_posts[0].post_id}"
+    authorized_client.get(url)
+    authorized_client.get("/posts/")
+    authorized_client.delete(url)
+
+    assert authorized_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+    assert len(authorized_client.get("/posts/").json()) == len(test_posts) - 1
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Callable, ContextManager, Type
 
 from fastapi import status
 from fastapi.testclient import TestClient
@@ -18,6 +18,86 @@ def test_get_comments(
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_get_comments_cursor(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    first_page = authorized_client.get("/comments/", params={"limit": 2})
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = authorized_client.get(
+        "/comments/", params={"limit": 2, "after": cursor}
+    )
+    comment_ids = [
+        comment["comment_id"]
+        for comment in first_page.json() + second_page.json()
+    ]
+
+    assert comment_ids == sorted(
+        (comment.comment_id for comment in test_comments), reverse=True
+    )
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_comments_num_queries(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        authorized_client.get("/comments/")
+
+
+def test_get_comment_num_queries(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        authorized_client.get(f"/comments/{test_comments[0].comment_id}")
+
+
+def test_update_comment_num_queries(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    comment = test_comments[2]
+
+    with assert_num_queries(2):
+        response = authorized_client.put(
+            f"/comments/{comment.comment_id}",
+            json={"content": "Edited content.", "post_id": comment.post_id},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_delete_comment_num_queries(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        response = authorized_client.delete(
+            f"/comments/{test_comments[2].comment_id}"
+        )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_update_comment_post_not_exist(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    response = authorized_client.put(
+        f"/comments/{test_comments[2].comment_id}",
+        json={"content": "Edited content.", "post_id": 99999},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == (
+        "Post with post_id: 99999 does not exist."
+    )
+
+
 def test_unauthorized_user_get_comments(
     client: TestClient, test_comments: list[Type[Comment]]
 ) -> None:
@@ -56,6 +136,54 @@ def test_get_comment(
     assert comment.author.user_id == test_comments[0].user_id
 
 
+def test_get_comment_etag(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    url = f"/comments/{test_comments[2].comment_id}"
+    etag = authorized_client.get(url).headers["ETag"]
+
+    with assert_num_queries(1):
+        response = authorized_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    authorized_client.put(
+        url,
+        json={
+            "content": "Edited comment.",
+            "post_id": test_comments[0].post_id,
+        },
+    )
+    response = authorized_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["content"] == "Edited comment."
+
+
+def test_get_comments_etag(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    etag = authorized_client.get("/comments/").headers["ETag"]
+    response = authorized_client.get(
+        "/comments/", headers={"If-None-Match": f'"other", {etag}'}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    authorized_client.post(
+        "/comments/",
+        json={"content": "New comment.", "post_id": test_comments[0].post_id},
+    )
+    response = authorized_client.get(
+        "/comments/", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
 @mark.parametrize(
     "content, post_id, user_id",
     [
@@ -231,3 +359,73 @@ def test_delete_other_user_comment(
     )
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_comment_updates_post_counter(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    post_id = test_comments[0].post_id
+
+    response = authorized_client.post(
+        "/comments/",
+        json={"content": "Thanks for sharing this.", "post_id": post_id},
+    )
+    created = authorized_client.get(f"/posts/{post_id}").json()
+
+    authorized_client.delete(f"/comments/{response.json()['comment_id']}")
+    deleted = authorized_client.get(f"/posts/{post_id}").json()
+
+    assert created["comments"] == 2
+    assert deleted["comments"] == 1
+
+
+def test_create_comment_post_non_exist(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    response = authorized_client.post(
+        "/comments/",
+        json={"content": "Thanks for sharing this.", "post_id": 7},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_create_comments_batch(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    post_id = test_comments[0].post_id
+    data = [
+        {"content": "First imported comment.", "post_id": post_id},
+        {"content": "Comment on a missing post.", "post_id": 7},
+        {"content": "Second imported comment.", "post_id": post_id},
+    ]
+    response = authorized_client.post("/comments/batch", json=data)
+    post = authorized_client.get(f"/posts/{post_id}").json()
+
+    assert [result["status_code"] for result in response.json()] == [
+        status.HTTP_201_CREATED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_201_CREATED,
+    ]
+    assert post["comments"] == 3
+
+
+def test_delete_comments_batch(
+    authorized_client: TestClient, test_comments: list[Type[Comment]]
+) -> None:
+    comment_ids = [
+        test_comments[2].comment_id,
+        test_comments[0].comment_id,
+        7,
+    ]
+    response = authorized_client.request(
+        "DELETE", "/comments/batch", json=comment_ids
+    )
+    post = authorized_client.get(f"/posts/{test_comments[2].post_id}").json()
+
+    assert [result["status_code"] for result in response.json()] == [
+        status.HTTP_204_NO_CONTENT,
+        status.HTTP_403_FORBIDDEN,
+        status.HTTP_404_NOT_FOUND,
+    ]
+    assert post["comments"] == 0
@@ -0,0 +1,206 @@
+from typing import Callable, ContextManager, Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import fixture, MonkeyPatch
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import Post, Timeline
+from src.oauth2 import create_access_token
+
+
+POST_DATA = {
+    "title": "10 Personal Finance Tips for a Secure Future",
+    "content": "Saving early is the simplest way to a secure future.",
+    "category": "BUSINESS",
+}
+
+
+@fixture
+def second_user_headers(test_user_second: dict) -> dict[str, str]:
+    token = create_access_token({"user_id": test_user_second["user_id"]})
+
+    return {"Authorization": f"Bearer {token}"}
+
+
+def follow(client: TestClient, followee_id: int, followed: bool) -> None:
+    response = client.post(
+        "/follows/", json={"followee_id": followee_id, "followed": followed}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def get_feed_post_ids(client: TestClient, **params) -> list[int]:
+    response = client.get("/feed/", params=params)
+
+    assert response.status_code == status.HTTP_200_OK
+
+    return [post["Post"]["post_id"] for post in response.json()]
+
+
+def test_feed_contains_own_posts(authorized_client: TestClient) -> None:
+    post_id = authorized_client.post("/posts/", json=POST_DATA).json()[
+        "post_id"
+    ]
+
+    assert get_feed_post_ids(authorized_client) == [post_id]
+
+
+def test_feed_backfills_followed_user(
+    authorized_client: TestClient,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+) -> None:
+    assert get_feed_post_ids(authorized_client) == []
+
+    follow(authorized_client, test_user_second["user_id"], True)
+
+    assert get_feed_post_ids(authorized_client) == [
+        post.post_id
+        for post in test_posts
+        if post.user_id == test_user_second["user_id"]
+    ]
+
+
+def test_feed_fans_out_new_posts(
+    authorized_client: TestClient,
+    test_user_second: dict,
+    second_user_headers: dict[str, str],
+) -> None:
+    follow(authorized_client, test_user_second["user_id"], True)
+    post_id = authorized_client.post(
+        "/posts/", json=POST_DATA, headers=second_user_headers
+    ).json()["post_id"]
+    batch_ids = [
+        result["id"]
+        for result in authorized_client.post(
+            "/posts/batch", json=[POST_DATA], headers=second_user_headers
+        ).json()
+    ]
+
+    assert get_feed_post_ids(authorized_client) == batch_ids + [post_id]
+
+
+def test_feed_drops_unfollowed_user(
+    authorized_client: TestClient,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+) -> None:
+    follow(authorized_client, test_user_second["user_id"], True)
+    follow(authorized_client, test_user_second["user_id"], False)
+
+    assert get_feed_post_ids(authorized_client) == []
+
+
+def test_feed_pulls_popular_authors(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_user_second: dict,
+    second_user_headers: dict[str, str],
+    session: Session,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 0)
+    follow(authorized_client, test_user_second["user_id"], True)
+    post_id = authorized_client.post(
+        "/posts/", json=POST_DATA, headers=second_user_headers
+    ).json()["post_id"]
+    fanned_out = (
+        session.query(Timeline)
+        .filter_by(user_id=test_user["user_id"], post_id=post_id)
+        .count()
+    )
+
+    assert fanned_out == 0
+    assert get_feed_post_ids(authorized_client) == [post_id]
+
+
+def test_feed_keeps_pulled_posts_below_threshold(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_user_second: dict,
+    second_user_headers: dict[str, str],
+    session: Session,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    follow(authorized_client, test_user_second["user_id"], True)
+    third_user = authorized_client.post(
+        "/users/",
+        json={
+            "username": "james",
+            "email": "james@gmail.com",
+            "password": "!James123",
+        },
+    ).json()
+    third_user_token = create_access_token({"user_id": third_user["user_id"]})
+    authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user_second["user_id"], "followed": True},
+        headers={"Authorization": f"Bearer {third_user_token}"},
+    )
+    pulled_post_id = authorized_client.post(
+        "/posts/", json=POST_DATA, headers=second_user_headers
+    ).json()["post_id"]
+
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 10)
+    fanned_out_post_id = authorized_client.post(
+        "/posts/", json=POST_DATA, headers=second_user_headers
+    ).json()["post_id"]
+    timeline_post_ids = [
+        timeline.post_id
+        for timeline in session.query(Timeline).filter_by(
+            user_id=test_user["user_id"]
+        )
+    ]
+
+    assert timeline_post_ids == [fanned_out_post_id]
+    assert get_feed_post_ids(authorized_client) == [
+        fanned_out_post_id,
+        pulled_post_id,
+    ]
+
+
+def test_feed_cursor(
+    authorized_client: TestClient,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+) -> None:
+    follow(authorized_client, test_user_second["user_id"], True)
+    post_ids = [
+        authorized_client.post("/posts/", json=POST_DATA).json()["post_id"]
+        for _ in range(2)
+    ]
+    first_page = authorized_client.get("/feed/", params={"limit": 2})
+    second_page = authorized_client.get(
+        "/feed/",
+        params={"limit": 2, "after": first_page.headers["X-Next-Cursor"]},
+    )
+    feed_post_ids = [
+        post["Post"]["post_id"]
+        for post in first_page.json() + second_page.json()
+    ]
+
+    assert feed_post_ids == sorted(post_ids, reverse=True) + [
+        post.post_id
+        for post in test_posts
+        if post.user_id == test_user_second["user_id"]
+    ]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_feed_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        authorized_client.get("/feed/")
+
+
+def test_feed_unauthorized_user(client: TestClient) -> None:
+    response = client.get("/feed/")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,141 @@
+from typing import Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import fixture
+
+from src.models import Post
+
+
+@fixture
+def test_follow(authorized_client: TestClient, test_user_second: dict) -> None:
+    response = authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user_second["user_id"], "followed": True},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_follow_user(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_user_second: dict,
+    test_follow: None,
+) -> None:
+    followee = authorized_client.get(
+        f"/users/{test_user_second['user_id']}"
+    ).json()
+    followers = authorized_client.get(
+        f"/users/{test_user_second['user_id']}/followers"
+    ).json()
+    following = authorized_client.get(
+        f"/users/{test_user['user_id']}/following"
+    ).json()
+
+    assert followee["follower_count"] == 1
+    assert [user["user_id"] for user in followers] == [test_user["user_id"]]
+    assert [user["user_id"] for user in following] == [
+        test_user_second["user_id"]
+    ]
+
+
+def test_follow_keeps_followee_updated_at(
+    authorized_client: TestClient, test_user_second: dict
+) -> None:
+    url = f"/users/{test_user_second['user_id']}"
+    updated_at = authorized_client.get(url).json()["updated_at"]
+
+    for followed in (True, False):
+        authorized_client.post(
+            "/follows/",
+            json={
+                "followee_id": test_user_second["user_id"],
+                "followed": followed,
+            },
+        )
+
+    assert authorized_client.get(url).json()["updated_at"] == updated_at
+
+
+def test_follow_twice(
+    authorized_client: TestClient, test_user_second: dict, test_follow: None
+) -> None:
+    response = authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user_second["user_id"], "followed": True},
+    )
+    followee = authorized_client.get(
+        f"/users/{test_user_second['user_id']}"
+    ).json()
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert followee["follower_count"] == 1
+
+
+def test_follow_yourself(
+    authorized_client: TestClient, test_user: dict
+) -> None:
+    response = authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user["user_id"], "followed": True},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_follow_user_non_exist(authorized_client: TestClient) -> None:
+    response = authorized_client.post(
+        "/follows/", json={"followee_id": 99999, "followed": True}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_unfollow_user(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_user_second: dict,
+    test_follow: None,
+) -> None:
+    response = authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user_second["user_id"], "followed": False},
+    )
+    followee = authorized_client.get(
+        f"/users/{test_user_second['user_id']}"
+    ).json()
+    following = authorized_client.get(
+        f"/users/{test_user['user_id']}/following"
+    ).json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert followee["follower_count"] == 0
+    assert following == []
+
+
+def test_unfollow_user_non_exist(
+    authorized_client: TestClient, test_user_second: dict
+) -> None:
+    response = authorized_client.post(
+        "/follows/",
+        json={"followee_id": test_user_second["user_id"], "followed": False},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_followers_user_non_exist(authorized_client: TestClient) -> None:
+    response = authorized_client.get("/users/99999/followers")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_follow_unauthorized_user(
+    client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = client.post(
+        "/follows/", json={"followee_id": 1, "followed": True}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
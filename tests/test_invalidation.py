@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+from contextlib import suppress
+from typing import Callable, Iterator, Type
+
+import psycopg2
+from fastapi.testclient import TestClient
+from pytest import fixture, MonkeyPatch
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.invalidation import (
+    CHANNEL,
+    InvalidationListener,
+    local_caches,
+    MAX_PAYLOAD_SIZE,
+    split_payloads,
+)
+from src.models import Post, User
+from src.oauth2 import user_cache
+from src.post_cache import post_cache
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+
+    return True
+
+
+@fixture
+def listener(session: Session) -> Iterator[InvalidationListener]:
+    """
+    The function runs an invalidation listener connected
+    to the test database in a background thread.
+    """
+    listener = InvalidationListener(
+        url=SQLALCHEMY_DATABASE_URL,
+        batch_interval=0.01,
+        fallback_ttl=5,
+        heartbeat_interval=1,
+    )
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(listener.run())
+
+    def run() -> None:
+        with suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+
+    assert wait_until(lambda: listener.connected)
+
+    yield listener
+
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join()
+    loop.close()
+
+    for cache in local_caches():
+        cache.max_ttl = None
+
+
+@fixture
+def notifications() -> Iterator[Callable[[], set[str]]]:
+    """
+    The function listens to the invalidation channel of the test database
+    and returns a function that collects the keys received so far.
+    """
+    connection = psycopg2.connect(SQLALCHEMY_DATABASE_URL)
+    connection.autocommit = True
+    connection.cursor().execute(f"LISTEN {CHANNEL}")
+
+    def collect() -> set[str]:
+        connection.poll()
+
+        return {
+            key
+            for notification in connection.notifies
+            for key in notification.payload.split(",")
+        }
+
+    yield collect
+
+    connection.close()
+
+
+def test_split_payloads() -> None:
+    keys = [f"post:{post_id}" for post_id in range(2000)]
+    payloads = split_payloads(keys + keys)
+
+    assert len(payloads) > 1
+    assert all(len(payload) <= MAX_PAYLOAD_SIZE for payload in payloads)
+    assert ",".join(payloads).split(",") == keys
+
+
+def test_listener_evicts_keys(
+    listener: InvalidationListener, session: Session
+) -> None:
+    user_cache.set(1, "jessica")
+    asyncio.run(post_cache.set("post:2", b"{}", ttl=60))
+    session.execute(select(func.pg_notify(CHANNEL, "user:1,post:2")))
+    session.commit()
+
+    assert wait_until(lambda: listener.evicted == 2)
+    assert user_cache.get(1) is None
+    assert asyncio.run(post_cache.get("post:2")) is None
+
+
+def test_listener_fallback_ttl() -> None:
+    listener = InvalidationListener(
+        url=SQLALCHEMY_DATABASE_URL,
+        batch_interval=0.01,
+        fallback_ttl=5,
+        heartbeat_interval=1,
+    )
+    user_cache.set(1, "jessica")
+
+    try:
+        listener.set_connected(False)
+
+        assert user_cache.get(1) is None
+        assert all(cache.max_ttl == 5 for cache in local_caches())
+
+        listener.set_connected(True)
+
+        assert all(cache.max_ttl is None for cache in local_caches())
+    finally:
+        for cache in local_caches():
+            cache.max_ttl = None
+
+
+def test_writes_publish_invalidations(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_posts: list[Type[Post]],
+    session: Session,
+    notifications: Callable[[], set[str]],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_NOTIFY", True)
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+    user = session.get(User, test_user["user_id"])
+    user.first_name = "Jessica"
+    session.commit()
+
+    assert wait_until(
+        lambda: notifications()
+        == {
+            "posts:first-page",
+            f"post:{test_posts[2].post_id}",
+            f"user:{test_user['user_id']}",
+        }
+    )
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Callable, ContextManager, Type
 
 from fastapi import status
 from fastapi.testclient import TestClient
@@ -6,6 +6,7 @@ from pytest import fixture
 from sqlalchemy.orm import Session
 
 from src.models import Post, Like
+from src.reconcile import reconcile_post_counters
 
 
 @fixture
@@ -18,6 +19,7 @@ def test_like(
 
     session.add(new_like)
     session.commit()
+    reconcile_post_counters(session)
 
 
 def test_like_on_post(
@@ -82,3 +84,108 @@ def test_like_unauthorized_user(
     )
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_like_updates_post_counter(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[2].post_id
+
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+    liked = authorized_client.get(f"/posts/{post_id}").json()
+
+    authorized_client.post(
+        "/likes/", json={"post_id": post_id, "liked": False}
+    )
+    unliked = authorized_client.get(f"/posts/{post_id}").json()
+
+    assert liked["likes"] == 1
+    assert unliked["likes"] == 0
+
+
+def test_like_own_post(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.post(
+        "/likes/", json={"post_id": test_posts[0].post_id, "liked": True}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_like_twice_keeps_post_counter(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    test_like: None,
+) -> None:
+    post_id = test_posts[2].post_id
+
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+
+    assert authorized_client.get(f"/posts/{post_id}").json()["likes"] == 1
+
+
+def test_like_keeps_post_updated_at(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[2].post_id
+    updated_at = authorized_client.get(f"/posts/{post_id}").json()["Post"][
+        "updated_at"
+    ]
+
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+    authorized_client.post(
+        "/likes/batch", json=[{"post_id": post_id, "liked": False}]
+    )
+    authorized_client.post(
+        "/comments/", json={"content": "Great post!", "post_id": post_id}
+    )
+
+    assert (
+        authorized_client.get(f"/posts/{post_id}").json()["Post"]["updated_at"]
+        == updated_at
+    )
+
+
+def test_like_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    post_id = test_posts[2].post_id
+
+    with assert_num_queries(2):
+        liked = authorized_client.post(
+            "/likes/", json={"post_id": post_id, "liked": True}
+        )
+
+    with assert_num_queries(1):
+        unliked = authorized_client.post(
+            "/likes/", json={"post_id": post_id, "liked": False}
+        )
+
+    assert liked.status_code == status.HTTP_201_CREATED
+    assert unliked.status_code == status.HTTP_201_CREATED
+
+
+def test_like_posts_batch(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    test_like: None,
+) -> None:
+    data = [
+        {"post_id": test_posts[2].post_id, "liked": False},
+        {"post_id": test_posts[2].post_id, "liked": True},
+        {"post_id": test_posts[0].post_id, "liked": True},
+        {"post_id": 7, "liked": True},
+    ]
+    response = authorized_client.post("/likes/batch", json=data)
+    post = authorized_client.get(f"/posts/{test_posts[2].post_id}").json()
+
+    assert [result["status_code"] for result in response.json()] == [
+        status.HTTP_201_CREATED,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_403_FORBIDDEN,
+        status.HTTP_404_NOT_FOUND,
+    ]
+    assert post["likes"] == 0
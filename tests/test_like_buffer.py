@@ -0,0 +1,213 @@
+import asyncio
+from typing import Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import fixture, MonkeyPatch
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.like_buffer import like_buffer
+from src.models import Like, Post
+from src.reconcile import reconcile_post_counters
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@fixture
+def write_behind(monkeypatch: MonkeyPatch) -> None:
+    """
+    The function turns on the buffering of likes.
+    """
+    monkeypatch.setattr(settings, "LIKE_WRITE_BEHIND", True)
+
+
+def flush_likes() -> None:
+    async def flush() -> None:
+        async with TestingAsyncSessionLocal() as db:
+            await like_buffer.flush(db)
+
+    asyncio.run(flush())
+
+
+def get_like_count(session: Session, post_id: int) -> int:
+    session.expire_all()
+
+    return session.scalar(
+        select(Post.like_count).filter(Post.post_id == post_id)
+    )
+
+
+def count_likes(session: Session) -> int:
+    return session.scalar(select(func.count()).select_from(Like))
+
+
+def test_buffered_like(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+    write_behind: None,
+) -> None:
+    post_id = test_posts[2].post_id
+    response = authorized_client.post(
+        "/likes/", json={"post_id": post_id, "liked": True}
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert count_likes(session) == 0
+    assert authorized_client.get(f"/posts/{post_id}").json()["likes"] == 1
+
+    flush_likes()
+
+    assert count_likes(session) == 1
+    assert get_like_count(session, post_id) == 1
+    assert len(like_buffer) == 0
+    assert authorized_client.get(f"/posts/{post_id}").json()["likes"] == 1
+
+
+def test_buffered_like_twice(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    write_behind: None,
+) -> None:
+    like = {"post_id": test_posts[2].post_id, "liked": True}
+    authorized_client.post("/likes/", json=like)
+    response = authorized_client.post("/likes/", json=like)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
+def test_buffered_like_own_post(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    write_behind: None,
+) -> None:
+    response = authorized_client.post(
+        "/likes/", json={"post_id": test_posts[0].post_id, "liked": True}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert len(like_buffer) == 0
+
+
+def test_buffered_unlike_cancels_like(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+    write_behind: None,
+) -> None:
+    for liked in (True, False):
+        response = authorized_client.post(
+            "/likes/", json={"post_id": test_posts[2].post_id, "liked": liked}
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert len(like_buffer) == 0
+
+    response = authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": False}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    flush_likes()
+
+    assert count_likes(session) == 0
+    assert get_like_count(session, test_posts[2].post_id) == 0
+
+
+def test_buffered_like_during_flush(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    write_behind: None,
+) -> None:
+    post_id = test_posts[2].post_id
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+    # The flush has taken the intents but not committed them yet.
+    like_buffer.flushing, like_buffer.intents = like_buffer.intents, {}
+
+    assert authorized_client.get(f"/posts/{post_id}").json()["likes"] == 1
+
+    authorized_client.post(
+        "/likes/", json={"post_id": post_id, "liked": False}
+    )
+
+    assert authorized_client.get(f"/posts/{post_id}").json()["likes"] == 0
+
+
+def test_batch_after_buffered_likes(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+    write_behind: None,
+) -> None:
+    post_id = test_posts[2].post_id
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+    response = authorized_client.post(
+        "/likes/batch", json=[{"post_id": post_id, "liked": False}]
+    )
+
+    assert response.json()[0]["status_code"] == status.HTTP_201_CREATED
+    assert len(like_buffer) == 0
+
+    authorized_client.post("/likes/", json={"post_id": post_id, "liked": True})
+    response = authorized_client.post(
+        "/likes/batch", json=[{"post_id": post_id, "liked": True}]
+    )
+
+    assert response.json()[0]["status_code"] == status.HTTP_409_CONFLICT
+    assert count_likes(session) == 1
+    assert get_like_count(session, post_id) == 1
+
+
+def test_flush_batches_likes(
+    test_user: dict,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+    session: Session,
+) -> None:
+    session.add(
+        Like(
+            user_id=test_user_second["user_id"], post_id=test_posts[1].post_id
+        )
+    )
+    session.commit()
+    reconcile_post_counters(session)
+    like_buffer.add(test_user_second["user_id"], test_posts[0].post_id, True)
+    like_buffer.add(test_user_second["user_id"], test_posts[1].post_id, False)
+    like_buffer.add(test_user["user_id"], test_posts[2].post_id, True)
+    # Missing and own posts are skipped instead of failing the batch.
+    like_buffer.add(test_user["user_id"], test_posts[0].post_id, True)
+    like_buffer.add(test_user["user_id"], 0, True)
+
+    flush_likes()
+    like_counts = [
+        get_like_count(session, post.post_id) for post in test_posts
+    ]
+
+    assert count_likes(session) == 2
+    assert like_counts == [1, 0, 1]
+
+
+def test_flush_when_buffer_is_full(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_posts: list[Type[Post]],
+    session: Session,
+    write_behind: None,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(like_buffer, "max_size", 1)
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+    response = authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": False}
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert count_likes(session) == 1
+    assert like_buffer.intents == {
+        (test_user["user_id"], test_posts[2].post_id): False
+    }
@@ -0,0 +1,141 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Iterator, Type
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from pytest import fixture, MonkeyPatch, raises
+from starlette.websockets import WebSocketDisconnect
+
+from src.live import LiveHub, live_hub
+from src.main import app
+from src.models import Post
+
+
+@fixture
+def live_client(
+    authorized_client: TestClient, monkeypatch: MonkeyPatch
+) -> Iterator[TestClient]:
+    """
+    The function runs all requests of the authorized client
+    in one event loop, so the live connections see their events,
+    without starting the background tasks of the application.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> Iterator[None]:
+        yield
+
+    monkeypatch.setattr(app.router, "lifespan_context", lifespan)
+
+    with authorized_client:
+        yield authorized_client
+
+
+def test_live_comments(
+    live_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[0].post_id
+
+    with live_client.websocket_connect(f"/posts/{post_id}/live") as websocket:
+        live_client.post(
+            "/comments/", json={"content": "Great post!", "post_id": post_id}
+        )
+        live_client.post(
+            "/comments/batch",
+            json=[
+                {"content": "Thank you!", "post_id": post_id},
+                {"content": "Not this one.", "post_id": test_posts[1].post_id},
+            ],
+        )
+
+        events = [websocket.receive_json() for _ in range(2)]
+
+    assert [event["type"] for event in events] == ["comment", "comment"]
+    assert [event["comment"]["content"] for event in events] == [
+        "Great post!",
+        "Thank you!",
+    ]
+    assert events[0]["comment"]["author"]["username"] == "jessica"
+
+
+def test_live_likes_coalesced(
+    live_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[2].post_id
+
+    with live_client.websocket_connect(f"/posts/{post_id}/live") as websocket:
+        for liked in (True, False, True):
+            live_client.post(
+                "/likes/", json={"post_id": post_id, "liked": liked}
+            )
+        live_client.portal.call(live_hub.flush_likes)
+        live_client.portal.call(live_hub.flush_likes)
+        live_client.post(
+            "/comments/", json={"content": "Great post!", "post_id": post_id}
+        )
+
+        events = [websocket.receive_json() for _ in range(2)]
+
+    assert events[0] == {"type": "likes", "post_id": post_id, "delta": 1}
+    assert events[1]["type"] == "comment"
+
+
+def test_live_token_query_parameter(
+    test_posts: list[Type[Post]], token: str
+) -> None:
+    client = TestClient(app=app)
+    url = f"/posts/{test_posts[0].post_id}/live"
+
+    with client.websocket_connect(f"{url}?token={token}"):
+        pass
+
+    with raises(WebSocketDisconnect) as error:
+        with client.websocket_connect(url):
+            pass
+
+    assert error.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+def test_live_post_not_exist(authorized_client: TestClient) -> None:
+    response = authorized_client.get("/posts/0/live")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    with raises(WebSocketDisconnect) as error:
+        with authorized_client.websocket_connect("/posts/0/live"):
+            pass
+
+    assert error.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+def test_live_events_unauthorized(
+    client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = client.get(f"/posts/{test_posts[0].post_id}/live")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_live_hub_drops_slow_subscribers() -> None:
+    async def publish() -> None:
+        hub = LiveHub(queue_size=2, like_interval=1)
+
+        with hub.subscribe(1) as slow, hub.subscribe(1) as fast:
+            for number in range(3):
+                hub.publish(1, {"type": "test", "number": number})
+                event = await fast.receive()
+
+                assert event.text == f'{{"type":"test","number":{number}}}'
+                assert event.sse == (
+                    b"event: test\ndata: " + event.text.encode() + b"\n\n"
+                )
+
+            assert slow.dropped
+            assert await slow.receive() is None
+            assert hub.subscribers == {1: {fast}}
+            assert hub.dropped == 1
+
+        assert hub.subscribers == {}
+
+    asyncio.run(publish())
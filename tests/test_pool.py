@@ -0,0 +1,117 @@
+import asyncio
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import mark, MonkeyPatch, raises
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.routers import internal
+from src.pool import (
+    MeasuredAsyncAdaptedQueuePool,
+    MeasuredQueuePool,
+    prewarm_pool,
+)
+from tests.conftest import (
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    SQLALCHEMY_DATABASE_URL,
+)
+
+
+def test_pool_metrics(client: TestClient, monkeypatch: MonkeyPatch) -> None:
+    response = client.get("/internal/pool")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    monkeypatch.setattr(settings, "INTERNAL_ENDPOINTS", True)
+    response = client.get("/internal/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == {"primary"}
+    assert response.json()["primary"]["size"] == settings.DATABASE_POOL_SIZE
+    assert set(response.json()["primary"]) == {
+        "size",
+        "checked_out",
+        "idle",
+        "overflow",
+        "checkouts",
+        "timeouts",
+        "wait_avg",
+        "wait_max",
+    }
+
+
+def test_pool_metrics_replica(
+    client: TestClient, monkeypatch: MonkeyPatch
+) -> None:
+    replica_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, poolclass=MeasuredQueuePool, pool_size=2
+    )
+    monkeypatch.setattr(settings, "INTERNAL_ENDPOINTS", True)
+    monkeypatch.setattr(internal, "replica_session_engine", replica_engine)
+    response = client.get("/internal/pool")
+    replica_engine.dispose()
+
+    assert set(response.json()) == {"primary", "replica"}
+    assert response.json()["replica"]["size"] == 2
+
+
+def test_prewarm_pool() -> None:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, poolclass=MeasuredQueuePool, pool_size=3
+    )
+    asyncio.run(prewarm_pool(engine, 3))
+    metrics = engine.pool.metrics()
+    engine.dispose()
+
+    assert metrics["idle"] == 3
+    assert metrics["checked_out"] == 0
+    assert metrics["checkouts"] == 3
+    assert metrics["wait_max"] >= metrics["wait_avg"] > 0
+
+
+@mark.parametrize("size", [1, 3])
+def test_prewarm_async_pool(size: int) -> None:
+    async def prewarm() -> dict[str, float]:
+        engine = create_async_engine(
+            ASYNC_SQLALCHEMY_DATABASE_URL,
+            poolclass=MeasuredAsyncAdaptedQueuePool,
+            pool_size=size,
+        )
+        await prewarm_pool(engine, size)
+        metrics = engine.pool.metrics()
+        await engine.dispose()
+
+        return metrics
+
+    metrics = asyncio.run(prewarm())
+
+    assert metrics["idle"] == size
+    assert metrics["checkouts"] == size
+
+
+def test_pool_timeouts() -> None:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=MeasuredQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.01,
+    )
+
+    with engine.connect(), engine.connect():
+        assert engine.pool.metrics()["overflow"] == 1
+
+        with raises(TimeoutError):
+            engine.connect()
+
+        assert engine.pool.metrics()["checked_out"] == 2
+
+    metrics = engine.pool.metrics()
+    engine.dispose()
+
+    assert metrics["timeouts"] == 1
+    assert metrics["checkouts"] == 2
+    assert metrics["idle"] == 1
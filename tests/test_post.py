@@ -1,10 +1,17 @@
-from typing import Type
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, ContextManager, Type
 
 from fastapi import status
 from fastapi.testclient import TestClient
 from pytest import mark
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
-from src.models import Post
+from src.models import Comment, Post
+from src.pagination import encode_cursor
+from src.post_cache import post_cache
 from src.schemas import PostResponse, PostLikeCommentResponse
 
 
@@ -19,6 +26,391 @@ def test_get_posts(
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_get_posts_cursor(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    first_page = authorized_client.get("/posts/", params={"limit": 2})
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = authorized_client.get(
+        "/posts/", params={"limit": 2, "after": cursor}
+    )
+    post_ids = [
+        post["Post"]["post_id"]
+        for post in first_page.json() + second_page.json()
+    ]
+
+    assert post_ids == sorted(
+        (post.post_id for post in test_posts), reverse=True
+    )
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_posts_invalid_cursor(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get("/posts/", params={"after": "invalid"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mark.parametrize("position", [1.5, True, None])
+def test_get_posts_cursor_wrong_type(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    position: float | bool | None,
+) -> None:
+    cursor = base64.urlsafe_b64encode(json.dumps([position, 3]).encode())
+    post_id = test_posts[0].post_id
+
+    for url in ("/posts/", f"/posts/{post_id}/comments", "/feed/"):
+        response = authorized_client.get(
+            url, params={"after": cursor.decode()}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mark.parametrize(
+    "url, params",
+    [
+        ("/posts/", {"limit": -1}),
+        ("/posts/", {"limit": 101}),
+        ("/posts/", {"offset": -1}),
+        ("/posts/search", {"q": "climate", "limit": 0}),
+        ("/posts/trending", {"limit": -1}),
+        ("/feed/", {"limit": -1}),
+        ("/comments/", {"offset": -1}),
+    ],
+)
+def test_get_posts_out_of_bounds(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    url: str,
+    params: dict[str, int | str],
+) -> None:
+    response = authorized_client.get(url, params=params)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_posts_category(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get("/posts/", params={"category": "FOOD"})
+
+    assert [post["Post"]["post_id"] for post in response.json()] == [
+        test_posts[2].post_id
+    ]
+
+
+def test_get_posts_author(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_posts: list[Type[Post]],
+) -> None:
+    response = authorized_client.get(
+        "/posts/", params={"author_id": test_user["user_id"], "limit": 1}
+    )
+    second_page = authorized_client.get(
+        "/posts/",
+        params={
+            "author_id": test_user["user_id"],
+            "after": response.headers["X-Next-Cursor"],
+        },
+    )
+    post_ids = [
+        post["Post"]["post_id"]
+        for post in response.json() + second_page.json()
+    ]
+
+    assert post_ids == [test_posts[1].post_id, test_posts[0].post_id]
+
+
+def test_get_posts_date_range(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+) -> None:
+    now = datetime.now(timezone.utc)
+
+    for days, post in zip((10, 5, 1), test_posts):
+        session.execute(
+            update(Post)
+            .filter(Post.post_id == post.post_id)
+            .values(created_at=now - timedelta(days=days))
+        )
+    session.commit()
+
+    response = authorized_client.get(
+        "/posts/",
+        params={
+            "since": (now - timedelta(days=7)).isoformat(),
+            "until": (now - timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert [post["Post"]["post_id"] for post in response.json()] == [
+        test_posts[1].post_id
+    ]
+
+
+def test_get_posts_invalid_category(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get("/posts/", params={"category": "OTHER"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_search_posts(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get(
+        "/posts/search", params={"q": "public speaking"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["Post"]["post_id"] for post in response.json()] == [
+        test_posts[1].post_id
+    ]
+
+
+def test_search_posts_category(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get(
+        "/posts/search", params={"q": "climate or burgers", "category": "FOOD"}
+    )
+
+    assert [post["Post"]["post_id"] for post in response.json()] == [
+        test_posts[2].post_id
+    ]
+
+
+def test_search_posts_ranking(authorized_client: TestClient) -> None:
+    in_content = authorized_client.post(
+        "/posts/",
+        json={
+            "title": "Weekend notes",
+            "content": "A little gardening on Sunday morning.",
+            "category": "LIFESTYLE",
+        },
+    ).json()
+    in_title = authorized_client.post(
+        "/posts/",
+        json={
+            "title": "Gardening basics for beginners",
+            "content": "Tomatoes need a lot of sun and water.",
+            "category": "LIFESTYLE",
+        },
+    ).json()
+    response = authorized_client.get(
+        "/posts/search", params={"q": "gardening"}
+    )
+
+    assert [post["Post"]["post_id"] for post in response.json()] == [
+        in_title["post_id"],
+        in_content["post_id"],
+    ]
+
+
+def test_search_posts_cursor(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    params = {"q": "climate or speaking or burgers", "limit": 2}
+    first_page = authorized_client.get("/posts/search", params=params)
+    second_page = authorized_client.get(
+        "/posts/search",
+        params={**params, "after": first_page.headers["X-Next-Cursor"]},
+    )
+    post_ids = [
+        post["Post"]["post_id"]
+        for post in first_page.json() + second_page.json()
+    ]
+
+    assert sorted(post_ids) == sorted(post.post_id for post in test_posts)
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_search_posts_cursor_wrong_type(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get(
+        "/posts/search",
+        params={
+            "q": "climate",
+            "after": encode_cursor(datetime.now(timezone.utc), 3),
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_search_posts_empty_query(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get("/posts/search", params={"q": ""})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_posts_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        authorized_client.get("/posts/")
+
+
+def test_get_post_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        authorized_client.get(f"/posts/{test_posts[2].post_id}")
+
+
+def test_get_post_etag(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    url = f"/posts/{test_posts[2].post_id}"
+    etag = authorized_client.get(url).headers["ETag"]
+    post_cache.clear()
+
+    with assert_num_queries(1):
+        response = authorized_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+    response = authorized_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["likes"] == 1
+
+
+def test_get_posts_etag(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    etag = authorized_client.get("/posts/").headers["ETag"]
+    response = authorized_client.get(
+        "/posts/", headers={"If-None-Match": etag}
+    )
+
+    assert etag.startswith("W/")
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    authorized_client.put(
+        f"/posts/{test_posts[0].post_id}",
+        json={
+            "title": "The Impact of Climate Change on Farming",
+            "content": "Farmers are struggling to adapt.",
+            "category": "ENVIRONMENT",
+        },
+    )
+    response = authorized_client.get(
+        "/posts/", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == len(test_posts)
+
+
+def test_update_post_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    data = {
+        "title": "10 Personal Finance Tips for a Secure Future",
+        "content": "Saving early is the simplest way to a secure future.",
+        "category": "BUSINESS",
+    }
+
+    with assert_num_queries(2):
+        response = authorized_client.put(
+            f"/posts/{test_posts[0].post_id}", json=data
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == data["title"]
+
+
+def test_delete_post_num_queries(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    with assert_num_queries(2):
+        response = authorized_client.delete(f"/posts/{test_posts[0].post_id}")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_get_post_comments(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_posts: list[Type[Post]],
+    test_comments: list[Type[Comment]],
+    session: Session,
+) -> None:
+    post_id = test_posts[0].post_id
+    session.add_all(
+        Comment(
+            content=f"Reply number {number}.",
+            post_id=post_id,
+            user_id=test_user["user_id"],
+        )
+        for number in range(2)
+    )
+    session.commit()
+
+    first_page = authorized_client.get(
+        f"/posts/{post_id}/comments", params={"limit": 2}
+    )
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = authorized_client.get(
+        f"/posts/{post_id}/comments", params={"limit": 2, "after": cursor}
+    )
+    comments = first_page.json() + second_page.json()
+
+    assert first_page.status_code == status.HTTP_200_OK
+    assert [comment["comment_id"] for comment in comments] == sorted(
+        comment.comment_id
+        for comment in session.query(Comment).filter_by(post_id=post_id)
+    )
+    assert {comment["post_id"] for comment in comments} == {post_id}
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_post_comments_empty(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get(
+        f"/posts/{test_posts[0].post_id}/comments"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+def test_get_post_comments_not_exist(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    response = authorized_client.get("/posts/99999/comments")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 def test_unauthorized_user_get_posts(
     client: TestClient, test_posts: list[Type[Post]]
 ) -> None:
@@ -243,3 +635,54 @@ def test_delete_other_user_post(
     response = authorized_client.delete(f"/posts/{test_posts[2].post_id}")
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_create_posts_batch(
+    authorized_client: TestClient,
+    test_user: dict,
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    data = [
+        {
+            "title": f"Batch post number {number}",
+            "content": "Imported by the batch endpoint.",
+            "category": "TECHNOLOGY",
+        }
+        for number in range(3)
+    ]
+
+    # The current user, the insert and the fan-out to the timelines.
+    with assert_num_queries(3):
+        response = authorized_client.post("/posts/batch", json=data)
+
+    results = response.json()
+    posts = authorized_client.get("/posts/").json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["status_code"] for result in results] == [
+        status.HTTP_201_CREATED
+    ] * 3
+    assert {result["id"] for result in results} == {
+        post["Post"]["post_id"] for post in posts
+    }
+
+
+def test_delete_posts_batch(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_posts: list[Type[Post]],
+) -> None:
+    post_ids = [test_posts[0].post_id, test_posts[2].post_id, 7]
+    response = authorized_client.request(
+        "DELETE", "/posts/batch", json=post_ids
+    )
+
+    assert [result["status_code"] for result in response.json()] == [
+        status.HTTP_204_NO_CONTENT,
+        status.HTTP_403_FORBIDDEN,
+        status.HTTP_404_NOT_FOUND,
+    ]
+    assert (
+        authorized_client.get(f"/posts/{test_posts[0].post_id}").status_code
+        == status.HTTP_404_NOT_FOUND
+    )
@@ -0,0 +1,323 @@
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, Type
+
+from fastapi.testclient import TestClient
+from pytest import fixture
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from src.models import Base, Comment, Post
+from src.reconcile import reconcile_post_counters
+from tests.conftest import app_engine, engine
+
+
+LARGE_TABLES = {"user", "post", "comment", "like", "follow", "timeline"}
+
+SEED_STATEMENTS = (
+    """
+    INSERT INTO "user" (username, email, password)
+    SELECT 'seed' || n, 'seed' || n || '@example.com', 'password'
+    FROM generate_series(1, 2000) AS n
+    """,
+    """
+    INSERT INTO post (title, content, category, user_id)
+    SELECT
+        'Seed post ' || n,
+        'Seed content.',
+        (enum_range(NULL::category))[1 + n % 10],
+        "user".user_id
+    FROM "user" CROSS JOIN generate_series(1, 10) AS n
+    WHERE "user".username LIKE 'seed%'
+    """,
+    """
+    INSERT INTO comment (content, post_id, user_id)
+    SELECT 'Seed comment.', post.post_id, post.user_id
+    FROM post CROSS JOIN generate_series(1, 2) AS n
+    """,
+    """
+    INSERT INTO "like" (user_id, post_id)
+    SELECT "user".user_id, post.post_id
+    FROM post JOIN "user"
+    ON "user".username = 'seed' || (post.post_id % 2000 + 1)
+    AND "user".user_id <> post.user_id
+    """,
+    """
+    INSERT INTO follow (follower_id, followee_id)
+    SELECT follower.user_id, followee.user_id
+    FROM "user" AS follower CROSS JOIN generate_series(1, 10) AS n
+    JOIN "user" AS followee
+    ON followee.username = 'seed' || ((follower.user_id + n) % 2000 + 1)
+    WHERE follower.username LIKE 'seed%'
+    AND followee.user_id <> follower.user_id
+    """,
+    """
+    UPDATE "user" SET follower_count = (
+        SELECT count(*) FROM follow WHERE followee_id = "user".user_id
+    )
+    """,
+    """
+    INSERT INTO timeline (user_id, post_id, created_at)
+    SELECT follow.follower_id, post.post_id, post.created_at
+    FROM follow JOIN post ON post.user_id = follow.followee_id
+    """,
+)
+
+
+@fixture
+def large_dataset(
+    test_posts: list[Type[Post]],
+    test_comments: list[Type[Comment]],
+    session: Session,
+) -> None:
+    """
+    The function seeds the test database with enough rows
+    for the planner to prefer indexes wherever they exist.
+    """
+    for statement in SEED_STATEMENTS:
+        session.execute(text(statement))
+    session.commit()
+    reconcile_post_counters(session)
+    session.execute(
+        text("UPDATE post SET trending_score = like_count + comment_count")
+    )
+    session.commit()
+
+    # `VACUUM` also moves the new rows out of the pending list
+    # of the GIN index, which the planner would otherwise avoid.
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        connection.exec_driver_sql("VACUUM ANALYZE")
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[tuple[str, Any]]]:
+    """
+    The function collects every statement the application sends
+    to the database together with its parameters.
+    """
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0]
+        statements.append((statement, parameters))
+
+    event.listen(app_engine, "before_cursor_execute", collect)
+    try:
+        yield statements
+    finally:
+        event.remove(app_engine, "before_cursor_execute", collect)
+
+
+def find_sequential_scans(plan: dict) -> list[str]:
+    """
+    The function returns the large tables a plan reads sequentially.
+    """
+    tables = []
+
+    if (
+        plan["Node Type"] == "Seq Scan"
+        and plan["Relation Name"] in LARGE_TABLES
+    ):
+        tables.append(plan["Relation Name"])
+
+    for subplan in plan.get("Plans", []):
+        tables.extend(find_sequential_scans(subplan))
+
+    return tables
+
+
+def explain(statement: str, parameters: Any = None) -> list[str]:
+    """
+    The function returns the large tables scanned sequentially
+    by a `statement` without executing it.
+    """
+    if isinstance(parameters, (list, tuple)):
+        # asyncpg numbers its placeholders, psycopg2 expects named ones.
+        statement = re.sub(r"\$(\d+)", r"%(p\1)s", statement)
+        parameters = {
+            f"p{number}": value
+            for number, value in enumerate(parameters, start=1)
+        }
+
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar()
+
+    return find_sequential_scans(plan[0]["Plan"])
+
+
+def assert_no_sequential_scans(statements: list[tuple[str, Any]]) -> None:
+    """
+    The function fails the test if any of the `statements`
+    reads a large table sequentially.
+    """
+    failures = []
+
+    for statement, parameters in statements:
+        if statement.lstrip().split(None, 1)[0].upper() not in {
+            "SELECT",
+            "INSERT",
+            "UPDATE",
+            "DELETE",
+        }:
+            continue
+
+        tables = explain(statement, parameters)
+
+        if tables:
+            failures.append(f"{', '.join(tables)}:\n{statement}")
+
+    assert not failures, "\n\n".join(failures)
+
+
+def test_router_queries_use_indexes(
+    authorized_client: TestClient,
+    test_user: dict,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+    test_comments: list[Type[Comment]],
+    large_dataset: None,
+) -> None:
+    own_post_id = test_posts[0].post_id
+    other_post_id = test_posts[2].post_id
+    own_comment_id = next(
+        comment.comment_id
+        for comment in test_comments
+        if comment.user_id == test_user["user_id"]
+    )
+    post_data = {
+        "title": "How to Improve Your Public Speaking Skills",
+        "content": "Public speaking is an essential skill for success.",
+        "category": "EDUCATION",
+    }
+    comment_data = {
+        "content": "Well said! The content is on point and relevant.",
+        "post_id": other_post_id,
+    }
+
+    with capture_statements() as statements:
+        first_page = authorized_client.get("/posts/")
+        requests = [
+            first_page,
+            authorized_client.get(
+                "/posts/",
+                params={"after": first_page.headers["X-Next-Cursor"]},
+            ),
+            authorized_client.get("/posts/", params={"category": "FOOD"}),
+            authorized_client.get(
+                "/posts/", params={"author_id": test_user["user_id"]}
+            ),
+            authorized_client.get(
+                "/posts/",
+                params={
+                    "since": "2026-01-01T00:00:00+00:00",
+                    "until": "2026-01-08T00:00:00+00:00",
+                },
+            ),
+            authorized_client.get(f"/posts/{own_post_id}"),
+            authorized_client.get(
+                f"/posts/{own_post_id}", headers={"If-None-Match": '"stale"'}
+            ),
+            authorized_client.get(f"/posts/{own_post_id}/comments"),
+            authorized_client.get(
+                "/posts/search", params={"q": "climate", "category": "FOOD"}
+            ),
+            authorized_client.get("/posts/trending"),
+            authorized_client.put(f"/posts/{own_post_id}", json=post_data),
+            authorized_client.get("/comments/"),
+            authorized_client.get(f"/comments/{own_comment_id}"),
+            authorized_client.get(
+                f"/comments/{own_comment_id}",
+                headers={"If-None-Match": '"stale"'},
+            ),
+            authorized_client.put(
+                f"/comments/{own_comment_id}", json=comment_data
+            ),
+            authorized_client.post(
+                "/likes/", json={"post_id": other_post_id, "liked": True}
+            ),
+            authorized_client.post(
+                "/likes/", json={"post_id": other_post_id, "liked": False}
+            ),
+            authorized_client.post(
+                "/likes/batch",
+                json=[{"post_id": other_post_id, "liked": True}],
+            ),
+            authorized_client.get(f"/users/{test_user_second['user_id']}"),
+            authorized_client.get(
+                f"/users/{test_user_second['user_id']}/followers"
+            ),
+            authorized_client.get(f"/users/{test_user['user_id']}/following"),
+            authorized_client.post(
+                "/follows/",
+                json={
+                    "followee_id": test_user_second["user_id"],
+                    "followed": True,
+                },
+            ),
+            authorized_client.get("/feed/"),
+            authorized_client.post(
+                "/follows/",
+                json={
+                    "followee_id": test_user_second["user_id"],
+                    "followed": False,
+                },
+            ),
+            authorized_client.post(
+                "/login",
+                data={
+                    "username": test_user["email"],
+                    "password": test_user["password"],
+                },
+            ),
+        ]
+        new_post = authorized_client.post("/posts/", json=post_data)
+        new_posts = authorized_client.post("/posts/batch", json=[post_data])
+        new_comment = authorized_client.post("/comments/", json=comment_data)
+        new_comments = authorized_client.post(
+            "/comments/batch", json=[comment_data]
+        )
+        requests += [
+            new_post,
+            new_posts,
+            new_comment,
+            new_comments,
+            authorized_client.delete(
+                f"/comments/{new_comment.json()['comment_id']}"
+            ),
+            authorized_client.request(
+                "DELETE",
+                "/comments/batch",
+                json=[new_comments.json()[0]["id"]],
+            ),
+            authorized_client.delete(f"/posts/{new_post.json()['post_id']}"),
+            authorized_client.request(
+                "DELETE", "/posts/batch", json=[new_posts.json()[0]["id"]]
+            ),
+        ]
+
+    assert all(response.is_success for response in requests)
+    assert_no_sequential_scans(statements)
+
+
+def test_foreign_key_lookups_use_indexes(
+    test_posts: list[Type[Post]], large_dataset: None
+) -> None:
+    # Deleting a parent row makes the database look up the child rows
+    # of every foreign key, so each of those lookups must use an index.
+    statements = [
+        (
+            f'SELECT 1 FROM "{table.name}" '
+            f"WHERE {foreign_key.parent.name} = %(value)s",
+            {"value": test_posts[0].post_id},
+        )
+        for table in Base.metadata.sorted_tables
+        for foreign_key in table.foreign_keys
+    ]
+
+    assert statements
+    assert_no_sequential_scans(statements)
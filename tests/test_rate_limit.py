@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.rate_limit import InMemoryTokenBucketBackend
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refill() -> None:
+    timer = FakeTimer()
+    backend = InMemoryTokenBucketBackend(maxsize=10, timer=timer)
+
+    def take() -> float:
+        return asyncio.run(backend.take("ip:1", capacity=2, refill_rate=0.5))
+
+    assert take() == 0
+    assert take() == 0
+    assert take() == 2
+
+    timer.now = 2
+    assert take() == 0
+    assert take() == 2
+
+
+def test_login_rate_limit(client: TestClient, test_user: dict) -> None:
+    # Creating `test_user` has already taken one token of the account.
+    responses = [
+        client.post(
+            "/login",
+            data={"username": test_user["email"], "password": "!Jesica123"},
+        )
+        for _ in range(5)
+    ]
+
+    assert [response.status_code for response in responses] == [
+        status.HTTP_403_FORBIDDEN
+    ] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS]
+    assert int(responses[-1].headers["Retry-After"]) > 0
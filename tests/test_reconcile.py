@@ -0,0 +1,45 @@
+from typing import Type
+
+from sqlalchemy.orm import Session
+
+from src.models import Comment, Follow, Post, User
+from src.reconcile import reconcile_follower_counters, reconcile_post_counters
+
+
+def test_reconcile_post_counters(
+    session: Session, test_comments: list[Type[Comment]]
+) -> None:
+    post = session.query(Post).first()
+    post.like_count = 5
+    post.comment_count = 0
+    session.commit()
+
+    repaired = reconcile_post_counters(session)
+    session.refresh(post)
+
+    assert repaired == 1
+    assert post.like_count == 0
+    assert post.comment_count == 1
+    assert reconcile_post_counters(session) == 0
+
+
+def test_reconcile_follower_counters(
+    session: Session, test_user: dict, test_user_second: dict
+) -> None:
+    session.add(
+        Follow(
+            follower_id=test_user["user_id"],
+            followee_id=test_user_second["user_id"],
+        )
+    )
+    session.commit()
+    followee = session.get(User, test_user_second["user_id"])
+    updated_at = followee.updated_at
+
+    repaired = reconcile_follower_counters(session)
+    session.refresh(followee)
+
+    assert repaired == 1
+    assert followee.follower_count == 1
+    assert followee.updated_at == updated_at
+    assert reconcile_follower_counters(session) == 0
@@ -0,0 +1,223 @@
+import asyncio
+import time
+from typing import Iterator, Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import fixture, MonkeyPatch
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+
+from src.config import settings
+from src.database import get_async_replica_db, get_replica_db
+from src.main import app
+from src.models import Base, Comment, Post, User
+from src.oauth2 import create_access_token
+from src.post_cache import (
+    FIRST_PAGE_KEY,
+    pack_response,
+    post_cache,
+    post_key,
+)
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+REPLICA_DATABASE_URL = SQLALCHEMY_DATABASE_URL + "_replica"
+
+
+def create_replica_database() -> None:
+    """
+    The function creates the replica test database if it does not exist.
+    """
+    server_engine = create_engine(
+        REPLICA_DATABASE_URL.rsplit("/", 1)[0] + "/postgres",
+        isolation_level="AUTOCOMMIT",
+    )
+    name = REPLICA_DATABASE_URL.rsplit("/", 1)[1]
+
+    with server_engine.connect() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": name},
+        ).scalar()
+
+        if not exists:
+            connection.exec_driver_sql(f'CREATE DATABASE "{name}"')
+
+    server_engine.dispose()
+
+
+@fixture
+def replica_client(
+    authorized_client: TestClient,
+    test_comments: list[Type[Comment]],
+    session: Session,
+    monkeypatch: MonkeyPatch,
+) -> Iterator[TestClient]:
+    """
+    The function copies the `users` and the `posts`, with changed names
+    and titles, but not the `comments`, to a second database,
+    which simulates a lagging read replica, and routes the reads to it.
+    """
+    create_replica_database()
+    replica_engine = create_engine(REPLICA_DATABASE_URL, poolclass=NullPool)
+    Base.metadata.drop_all(bind=replica_engine)
+    Base.metadata.create_all(bind=replica_engine)
+
+    users = session.execute(select(User.__table__)).mappings().all()
+    posts = (
+        session.execute(
+            select(
+                *(
+                    column
+                    for column in Post.__table__.c
+                    if column.computed is None
+                )
+            )
+        )
+        .mappings()
+        .all()
+    )
+
+    with replica_engine.begin() as connection:
+        connection.execute(
+            insert(User.__table__),
+            [
+                {**user, "username": f"{user['username']}_old"}
+                for user in users
+            ],
+        )
+        connection.execute(
+            insert(Post.__table__),
+            [{**post, "title": f"{post['title']} (old)"} for post in posts],
+        )
+
+    ReplicaSessionLocal = sessionmaker(
+        autoflush=False, expire_on_commit=False, bind=replica_engine
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        autoflush=False,
+        expire_on_commit=False,
+        bind=create_async_engine(
+            REPLICA_DATABASE_URL.replace(
+                "postgresql://", "postgresql+asyncpg://", 1
+            ),
+            poolclass=NullPool,
+        ),
+    )
+
+    def override_get_replica_db():
+        with ReplicaSessionLocal() as db:
+            yield db
+
+    async def override_get_async_replica_db():
+        async with AsyncReplicaSessionLocal() as db:
+            yield db
+
+    monkeypatch.setattr(settings, "POSTGRES_REPLICA_HOST", "localhost")
+    monkeypatch.setitem(
+        app.dependency_overrides, get_replica_db, override_get_replica_db
+    )
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        get_async_replica_db,
+        override_get_async_replica_db,
+    )
+
+    yield authorized_client
+
+    replica_engine.dispose()
+
+
+def test_reads_use_replica(
+    replica_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[0].post_id
+    user_id = test_posts[0].user_id
+
+    assert replica_client.get(f"/users/{user_id}").json()["username"] == (
+        "jessica_old"
+    )
+    assert replica_client.get(f"/posts/{post_id}").json()["Post"]["title"] == (
+        f"{test_posts[0].title} (old)"
+    )
+    assert all(
+        post["Post"]["title"].endswith("(old)")
+        for post in replica_client.get("/posts/").json()
+    )
+    assert replica_client.get("/comments/").json() == []
+
+
+def test_replica_reads_are_not_cached(
+    replica_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[0].post_id
+    replica_client.get(f"/posts/{post_id}")
+    replica_client.get("/posts/")
+
+    assert asyncio.run(post_cache.get(post_key(post_id))) is None
+    assert asyncio.run(post_cache.get(FIRST_PAGE_KEY)) is None
+
+
+def test_recent_writer_skips_cache(
+    replica_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    post_id = test_posts[2].post_id
+    stale_entry = pack_response('"stale"', b"{}")
+    asyncio.run(post_cache.set(post_key(post_id), stale_entry, ttl=60))
+    replica_client.post(
+        "/comments/",
+        json={"content": "Great post!", "post_id": test_posts[0].post_id},
+    )
+    asyncio.run(post_cache.set(FIRST_PAGE_KEY, b"{}", ttl=60))
+    response = replica_client.get(f"/posts/{post_id}")
+
+    assert response.json()["Post"]["title"] == test_posts[2].title
+    assert asyncio.run(post_cache.get(post_key(post_id))) != stale_entry
+    assert all(
+        not post["Post"]["title"].endswith("(old)")
+        for post in replica_client.get("/posts/").json()
+    )
+
+
+def test_read_your_writes(
+    replica_client: TestClient,
+    test_user_second: dict,
+    test_posts: list[Type[Post]],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.5)
+    second_client = TestClient(app=app)
+    second_client.headers = {
+        **second_client.headers,
+        "Authorization": "Bearer "
+        + create_access_token({"user_id": test_user_second["user_id"]}),
+    }
+
+    response = replica_client.post(
+        "/comments/", json={"content": "Great post!", "post_id": 0}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert replica_client.get("/comments/").json() == []
+
+    response = replica_client.post(
+        "/comments/",
+        json={"content": "Great post!", "post_id": test_posts[0].post_id},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(replica_client.get("/comments/").json()) == 4
+    assert second_client.get("/comments/").json() == []
+    assert (
+        TestClient(app=app)
+        .get(f"/users/{test_user_second['user_id']}")
+        .json()["username"]
+        == "jones_old"
+    )
+
+    time.sleep(0.6)
+
+    assert replica_client.get("/comments/").json() == []
@@ -0,0 +1,38 @@
+from typing import Type
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, Session
+
+from src.models import Comment, Post
+from src.schemas import CommentResponse, PostLikeCommentResponse
+from src.serializers import serialize_comment, serialize_post_row
+
+
+def test_serialize_post_row(
+    session: Session, test_posts: list[Type[Post]]
+) -> None:
+    rows = session.execute(
+        select(
+            Post,
+            Post.like_count.label("likes"),
+            Post.comment_count.label("comments"),
+        ).options(joinedload(Post.author))
+    ).all()
+
+    for row in rows:
+        assert serialize_post_row(row) == (
+            PostLikeCommentResponse.from_orm(row).dict()
+        )
+
+
+def test_serialize_comment(
+    session: Session, test_comments: list[Type[Comment]]
+) -> None:
+    comments = session.scalars(
+        select(Comment).options(joinedload(Comment.author))
+    ).all()
+
+    for comment in comments:
+        assert serialize_comment(comment) == (
+            CommentResponse.from_orm(comment).dict()
+        )
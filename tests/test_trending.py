@@ -0,0 +1,165 @@
+from datetime import timedelta
+from typing import Callable, ContextManager, Type
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import approx
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import Post
+from src.trending import decay_trending_scores, trending_board
+
+
+def get_trending_post_ids(client: TestClient) -> list[int]:
+    response = client.get("/posts/trending")
+
+    assert response.status_code == status.HTTP_200_OK
+
+    return [post["Post"]["post_id"] for post in response.json()]
+
+
+def get_trending_score(session: Session, post_id: int) -> float:
+    return session.scalar(
+        select(Post.trending_score).filter(Post.post_id == post_id)
+    )
+
+
+def test_trending_posts(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    authorized_client.post(
+        "/comments/",
+        json={"content": "Great post!", "post_id": test_posts[0].post_id},
+    )
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+
+    assert get_trending_post_ids(authorized_client) == [
+        test_posts[0].post_id,
+        test_posts[2].post_id,
+    ]
+
+
+def test_trending_posts_batch(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+) -> None:
+    authorized_client.post(
+        "/likes/batch",
+        json=[{"post_id": test_posts[2].post_id, "liked": True}],
+    )
+    authorized_client.post(
+        "/comments/batch",
+        json=[
+            {"content": "Great post!", "post_id": test_posts[1].post_id},
+            {"content": "Thank you!", "post_id": test_posts[1].post_id},
+        ],
+    )
+
+    assert get_trending_score(session, test_posts[2].post_id) == approx(
+        settings.TRENDING_LIKE_WEIGHT
+    )
+    assert get_trending_score(session, test_posts[1].post_id) == approx(
+        2 * settings.TRENDING_COMMENT_WEIGHT
+    )
+
+
+def test_trending_posts_unlike(
+    authorized_client: TestClient, test_posts: list[Type[Post]]
+) -> None:
+    for liked in (True, False):
+        authorized_client.post(
+            "/likes/", json={"post_id": test_posts[2].post_id, "liked": liked}
+        )
+
+    assert get_trending_post_ids(authorized_client) == []
+
+
+def test_trending_posts_comment_removed(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    session: Session,
+) -> None:
+    post_id = test_posts[1].post_id
+    comment_ids = [
+        result["id"]
+        for result in authorized_client.post(
+            "/comments/batch",
+            json=[{"content": "Great post!", "post_id": post_id}] * 3,
+        ).json()
+    ]
+    authorized_client.put(
+        f"/comments/{comment_ids[0]}",
+        json={"content": "Great post!", "post_id": test_posts[0].post_id},
+    )
+    authorized_client.delete(f"/comments/{comment_ids[1]}")
+    authorized_client.request(
+        "DELETE", "/comments/batch", json=[comment_ids[2]]
+    )
+
+    assert get_trending_score(session, post_id) == approx(0, abs=1e-6)
+    assert get_trending_score(session, test_posts[0].post_id) == approx(
+        settings.TRENDING_COMMENT_WEIGHT
+    )
+
+
+def test_trending_posts_served_from_memory(
+    authorized_client: TestClient,
+    test_posts: list[Type[Post]],
+    assert_num_queries: Callable[[int], ContextManager[list[str]]],
+) -> None:
+    assert get_trending_post_ids(authorized_client) == []
+
+    authorized_client.post(
+        "/likes/", json={"post_id": test_posts[2].post_id, "liked": True}
+    )
+
+    with assert_num_queries(0):
+        assert get_trending_post_ids(authorized_client) == []
+
+    trending_board.clear()
+
+    assert get_trending_post_ids(authorized_client) == [test_posts[2].post_id]
+
+
+def test_decay_trending_scores(
+    test_posts: list[Type[Post]], session: Session
+) -> None:
+    half_life = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+
+    for post, score in zip(test_posts, (8, settings.TRENDING_MIN_SCORE, 8)):
+        session.execute(
+            update(Post)
+            .filter(Post.post_id == post.post_id)
+            .values(
+                trending_score=score,
+                trending_decayed_at=func.now() - half_life,
+            )
+        )
+    session.execute(
+        update(Post)
+        .filter(Post.post_id == test_posts[2].post_id)
+        .values(trending_decayed_at=func.now())
+    )
+    session.commit()
+    updated_at = session.scalar(
+        select(Post.updated_at).filter(Post.post_id == test_posts[0].post_id)
+    )
+    session.execute(decay_trending_scores())
+    session.commit()
+
+    assert get_trending_score(session, test_posts[0].post_id) == approx(4)
+    assert get_trending_score(session, test_posts[1].post_id) == 0
+    assert get_trending_score(session, test_posts[2].post_id) == 8
+    assert (
+        session.scalar(
+            select(Post.updated_at).filter(
+                Post.post_id == test_posts[0].post_id
+            )
+        )
+        == updated_at
+    )
@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager
+
 from fastapi import status
 from fastapi.testclient import TestClient
 from jose import jwt
-from pytest import mark
+from pytest import mark, MonkeyPatch
 
+from src.config import settings
 from src.oauth2 import SECRET_KEY, ALGORITHM
 from src.schemas import UserResponse, Token
 
@@ -66,3 +70,48 @@ def test_incorrect_login(
     )
 
     assert response.status_code == status_code
+
+
+def test_stateless_login_user(
+    client: TestClient,
+    test_user: dict,
+    monkeypatch: MonkeyPatch,
+    assert_num_queries: Callable[[int], ContextManager],
+) -> None:
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    response = client.post(
+        "/login",
+        data={
+            "username": test_user["email"],
+            "password": test_user["password"],
+        },
+    )
+    access_token = Token(**response.json()).access_token
+    payload = jwt.decode(
+        token=access_token, key=SECRET_KEY, algorithms=[ALGORITHM]
+    )
+
+    with assert_num_queries(1):
+        comments = client.get(
+            "/comments/", headers={"Authorization": f"Bearer {access_token}"}
+        )
+
+    assert payload["username"] == test_user["username"]
+    assert payload["is_active"] is True
+    assert comments.status_code == status.HTTP_200_OK
+
+
+def test_expired_access_token(client: TestClient, test_user: dict) -> None:
+    access_token = jwt.encode(
+        claims={
+            "user_id": test_user["user_id"],
+            "exp": datetime.utcnow() - timedelta(minutes=1),
+        },
+        key=SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    response = client.get(
+        "/comments/", headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
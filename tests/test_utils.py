@@ -0,0 +1,79 @@
+import asyncio
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch, raises
+
+from src.config import settings
+from src.exceptions import PasswordHashingOverloadException
+from src.utils import password_hasher, PasswordHasher
+
+
+def test_password_hasher() -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue=4)
+    try:
+        hashed_password = asyncio.run(hasher.hash("!Jessica123"))
+        verified = asyncio.run(hasher.verify("!Jessica123", hashed_password))
+    finally:
+        hasher.shutdown()
+    metrics = hasher.metrics()
+
+    assert verified
+    assert metrics["calls"] == 2
+    assert metrics["pending"] == 0
+    assert metrics["hash_time_max"] > 0
+
+
+def test_password_hasher_restarts_broken_pool() -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue=4)
+    try:
+        asyncio.run(hasher.hash("!Jessica123"))
+
+        for process in hasher.executor._processes.values():
+            process.kill()
+            process.join()
+
+        with raises(PasswordHashingOverloadException) as error:
+            asyncio.run(hasher.hash("!Jessica123"))
+
+        hashed_password = asyncio.run(hasher.hash("!Jessica123"))
+        verified = asyncio.run(hasher.verify("!Jessica123", hashed_password))
+    finally:
+        hasher.shutdown()
+
+    assert error.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert verified
+    assert hasher.metrics()["restarts"] == 1
+
+
+def test_password_hashing_metrics(
+    client: TestClient, monkeypatch: MonkeyPatch
+) -> None:
+    response = client.get("/internal/password-hashing")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    monkeypatch.setattr(settings, "INTERNAL_ENDPOINTS", True)
+    response = client.get("/internal/password-hashing")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {"queue_wait_avg", "hash_time_max", "restarts"} <= set(
+        response.json()
+    )
+
+
+def test_password_hasher_queue_limit(
+    client: TestClient, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr(password_hasher, "max_queue", 0)
+    response = client.post(
+        "/users/",
+        json={
+            "username": "jessica",
+            "email": "jessica@gmail.com",
+            "password": "!Jessica123",
+        },
+    )
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"